@@ -0,0 +1,53 @@
+"""
+Deep path benchmark for `**`-heavy patterns.
+
+Compares the `regex` and `segment` engines on patterns with several `**` against long generated paths which almost,
+but not quite, match, the worst case for a backtracking regex.
+
+Usage:
+    python env/bench/deep_paths.py [--depth 40] [--runs 5]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from pylematch.pylematch import Pylematch  # noqa: E402
+
+PATTERNS = ['**/a/**/b/**/c/**/d', '**/a/**/b/**/c/', 'a/**/**/**/x.txt']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--depth', type=int, default=40, help='number of repeated `a/b/c/` segments in the path')
+    parser.add_argument('--runs', type=int, default=5, help='number of runs per measurement (best is taken)')
+    args = parser.parse_args()
+
+    path = 'z/' + 'a/b/c/' * args.depth + 'x'
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for pattern in PATTERNS:
+            timings = []
+
+            for engine in ('regex', 'segment'):
+                pylematch = Pylematch(root=tmp, engine=engine)
+                best = float('inf')
+
+                for _ in range(args.runs):
+                    rule = pylematch.PylematchRule(pattern, context='.', parent=pylematch)
+                    rule.match('')  # compile
+                    start = time.perf_counter()
+                    rule.match(path)
+                    best = min(best, (time.perf_counter() - start) * 1000)
+
+                timings.append(f"{engine}: {best:.3f} ms")
+
+            print(f"{pattern}: {', '.join(timings)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Startup budget benchmark.
+
+Measures the cost of a short-lived invocation, i.e., `python -c "import pylematch"` and an import followed by a
+single lazy `is_matched` query on a generated tree. The interpreter's own startup is measured and subtracted, so the
+figures reflect Pylematch only. Exits with a non-zero status if a budget is exceeded.
+
+Usage:
+    python env/bench/startup.py [--runs 20] [--import-budget 5] [--query-budget 50]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import subprocess
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from env.common.mktree import mktree  # noqa: E402
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+
+
+def measure(code, runs):
+    """Return the best wall-clock time (ms) of running `code` in a fresh interpreter."""
+    best = float('inf')
+
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True)
+        best = min(best, (time.perf_counter() - start) * 1000)
+
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=20, help='number of runs per measurement (best is taken)')
+    parser.add_argument('--import-budget', type=float, default=5.0, help='budget for `import pylematch`, ms')
+    parser.add_argument('--query-budget', type=float, default=50.0, help='budget for import plus one query, ms')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        mktree(path=tmp, dir_number=5, file_number=5, depth=4)
+        with open(os.path.join(tmp, '.pylematch'), 'w') as f:
+            f.write('**/*.log\n!dirA/**\n')
+
+        query = (
+            'from pylematch import Pylematch; '
+            f'Pylematch({tmp!r}, lazy=True).is_matched({os.path.join(tmp, "dirB", "dirC", "file0.log")!r})'
+        )
+
+        interpreter = measure('pass', args.runs)
+        results = {
+            'import': (measure('import pylematch', args.runs) - interpreter, args.import_budget),
+            'import + query': (measure(query, args.runs) - interpreter, args.query_budget),
+        }
+
+    failed = False
+    print(f"interpreter startup: {interpreter:.2f} ms (subtracted)")
+    for name, (elapsed, budget) in results.items():
+        status = 'OK' if elapsed <= budget else 'OVER BUDGET'
+        failed = failed or elapsed > budget
+        print(f"{name}: {elapsed:.2f} ms (budget {budget:.2f} ms) {status}")
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,5 +1,4 @@
 from pylematch.pylematch import Pylematch
-import os
 
 
 # ANSI escape codes for colors
@@ -13,6 +12,22 @@ class Colors:
     MAGENTA = "\033[35m"
 
 
+def explain(pylematch, path):
+    # Only the rules deciding the failing path are shown, not every rule of the tree
+    explanation = pylematch.explain(path)
+    if explanation is None or explanation['rule'] is None:
+        return f"{Colors.YELLOW}No rule matches{Colors.RESET}"
+
+    lines = [
+        f"{Colors.YELLOW}Decided by{Colors.RESET} '{explanation['rule'].pattern}' "
+        f"({explanation['filepath']}:{explanation['line']})"
+    ]
+    for rule in explanation['overridden']:
+        lines.append(f"{Colors.YELLOW}Overrides{Colors.RESET} '{rule.pattern}' ({rule.filepath}:{rule.line})")
+
+    return '\n'.join(lines)
+
+
 def run(test_path, test_cases, test_name):
     # Initialize the Pylematch object
     pylematch = Pylematch(root=test_path)
@@ -23,12 +38,19 @@ def run(test_path, test_cases, test_name):
         status = f"{Colors.BOLD}Matched{Colors.RESET}" if is_matched else "Ignored"
         print(f"{path}: {status}")
 
-    for path, rules in pylematch.get_all_rules():
-        print(f"{Colors.YELLOW}{os.path.relpath(path, test_path)}{Colors.RESET}")
-        for rule in rules:
-            _r = ', '.join(f"'{key}': '{Colors.CYAN}{value}{Colors.RESET}'" for key, value in rule.rule.items())
-            print(f"    {_r}")
+    for input, expected in test_cases.items():
+        output = pylematch.is_matched(test_path / input)
+        assert output == expected, (
+            f"{Colors.RED}Test {test_name} failed for '{input}': Expected '{expected}', got '{output}'{Colors.RESET}\n"
+            f"{explain(pylematch, test_path / input)}"
+        )
+
+    # The segment engine must give the same verdicts as the regex one
+    pylematch = Pylematch(root=test_path, engine='segment')
 
     for input, expected in test_cases.items():
         output = pylematch.is_matched(test_path / input)
-        assert output == expected, f"{Colors.RED}Test {test_name} failed for '{input}': Expected '{expected}', got '{output}'{Colors.RESET}"
+        assert output == expected, (
+            f"{Colors.RED}Test {test_name} failed for '{input}' (segment engine): Expected '{expected}', "
+            f"got '{output}'{Colors.RESET}\n{explain(pylematch, test_path / input)}"
+        )
@@ -0,0 +1,52 @@
+"""
+Checking the startup cost: lazy import, deferred scanning and lazy rule compilation.
+"""
+
+import sys
+import subprocess
+
+from env.common.run import run
+from env.common.mktree import mktree
+from pylematch.pylematch import Pylematch
+
+
+def test(tmp_path):
+    mktree(path=tmp_path, dir_number=2, file_number=1, depth=2)
+
+    if 1:  # Test 1: A bare import does not load the implementation module.
+        code = 'import sys, pylematch; print("pylematch.pylematch" in sys.modules, "re" in sys.modules)'
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+
+        assert output.split() == ['False', 'False'], f"Test 1 failed: unexpected modules loaded: {output}"
+
+        code = 'import sys, pylematch.pylematch; print("re" in sys.modules, "logging" in sys.modules)'
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+
+        assert output.split() == ['False', 'False'], f"Test 1 failed: unexpected modules loaded: {output}"
+
+    if 1:  # Test 2: Construction does not scan the tree, the first query does.
+        (tmp_path / '.pylematch').write_text('dirA/**')
+
+        pylematch = Pylematch(root=tmp_path)
+        assert not pylematch._matched, "Test 2 failed: the tree was scanned on construction"
+
+        assert pylematch.is_matched(tmp_path / 'dirA/file0.txt') is True, "Test 2 failed: wrong verdict"
+        assert pylematch._matched, "Test 2 failed: the tree was not scanned on the first query"
+
+    if 1:  # Test 3: Rules are compiled on first use.
+        pylematch = Pylematch(root=tmp_path)
+        rule = pylematch.PylematchRule('dirA/**', context='.', parent=pylematch)
+        assert rule._rule is None and rule._compiled is None, "Test 3 failed: the rule was compiled eagerly"
+
+        assert rule.match('dirA/file0.txt'), "Test 3 failed: wrong match"
+        assert rule._compiled is not None, "Test 3 failed: the compiled regex is not cached"
+
+    if 1:  # Test 4: Deferred scanning gives the same results.
+        test_cases = {
+            'dirA': False,
+            'dirA/dirB': True,
+            'dirA/file0.txt': True,
+            'dirB/file0.txt': False,
+        }
+
+        run(tmp_path, test_cases, test_name='4')
@@ -0,0 +1,57 @@
+"""
+Lazy on-demand classification test.
+"""
+
+import os
+
+from env.common.mktree import mktree
+from pylematch.pylematch import Pylematch
+
+
+def test(tmp_path):
+    mktree(path=tmp_path, dir_number=3, file_number=2, depth=3)
+
+    (tmp_path / '.pylematch').write_text('**/*.log\ndirB/\n')
+    (tmp_path / 'dirA/.pylematch').write_text('!file0.log\n*/*.txt\n')
+    (tmp_path / 'dirA/dirC/.pylematch').write_text('**\n!dirA/')
+
+    if 1:  # Test 1: Lazy verdicts are identical to the ones of a full scan.
+        eager = Pylematch(root=tmp_path)
+        lazy = Pylematch(root=tmp_path, lazy=True)
+
+        for path, expected in eager.matched():
+            output = lazy.is_matched(tmp_path / path)
+            assert output == expected, f"Test 1 failed for '{path}': Expected '{expected}', got '{output}'"
+
+        assert not lazy._loaded, "Test 1 failed: the lazy instance scanned the tree"
+
+    if 1:  # Test 2: Only the directories along the queried path are resolved.
+        lazy = Pylematch(root=tmp_path, lazy=True)
+
+        assert lazy.is_matched(tmp_path / 'dirA/dirC/file1.txt') is True, "Test 2 failed: wrong verdict"
+        assert set(lazy._rules) == {
+            str(tmp_path),
+            str(tmp_path / 'dirA'),
+            str(tmp_path / 'dirA/dirC'),
+        }, f"Test 2 failed: unexpected directories resolved: {sorted(lazy._rules)}"
+
+    if 1:  # Test 3: Paths outside the tree and missing paths have no verdict.
+        lazy = Pylematch(root=tmp_path, lazy=True)
+
+        for path in (tmp_path, tmp_path / 'missing.txt', tmp_path.parent, os.sep):
+            assert lazy.is_matched(path) is None, f"Test 3 failed for '{path}'"
+
+    if 1:  # Test 4: The verdict cache is bounded.
+        lazy = Pylematch(root=tmp_path, lazy=True, cache_size=4)
+
+        for path, _ in Pylematch(root=tmp_path).matched():
+            lazy.is_matched(tmp_path / path)
+
+        assert len(lazy._verdicts) == 4, f"Test 4 failed: {len(lazy._verdicts)} verdicts cached"
+
+    if 1:  # Test 5: A full listing in lazy mode falls back to the scan without duplicating rules.
+        lazy = Pylematch(root=tmp_path, lazy=True)
+        lazy.is_matched(tmp_path / 'dirA/dirC/file1.txt')
+
+        assert dict(lazy.matched()) == dict(Pylematch(root=tmp_path).matched()), "Test 5 failed: verdicts differ"
+        assert len(lazy.get_rules(str(tmp_path / 'dirA/dirC'))) == 6, "Test 5 failed: rules duplicated"
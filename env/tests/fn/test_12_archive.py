@@ -0,0 +1,106 @@
+"""
+Streaming archive builder test.
+"""
+
+import os
+import socket
+import tarfile
+import zipfile
+
+import pytest
+
+from env.common.mktree import mktree
+from pylematch.pylematch import Pylematch
+from pylematch.archive import archive
+
+
+def test(tmp_path):
+    root = tmp_path / 'root'
+    mktree(path=root, dir_number=3, file_number=2, depth=3)
+
+    (root / '.pylematch').write_text('*.log\n**/*.log\ndirB/\n')
+    (root / 'dirA/.pylematch').write_text('!file0.log\n')
+    (root / 'dirB/.pylematch').write_text('!file1.txt\n')  # never read, `dirB` is pruned
+
+    pylematch = Pylematch(root=root)
+
+    # With the default `exclude=True`, matched paths are left out and matched directories are pruned
+    excluded = [path.rstrip('/') for path, is_matched in pylematch.matched() if is_matched and path.endswith('/')]
+    expected = {
+        path.rstrip('/')
+        for path, is_matched in pylematch.matched()
+        if not is_matched and not any(path.startswith(directory + '/') for directory in excluded)
+    }
+
+    if 1:  # Test 1: A plain tar archive.
+        count = archive(pylematch, tmp_path / 'out.tar')
+
+        with tarfile.open(tmp_path / 'out.tar') as tar:
+            names = set(tar.getnames())
+
+        assert names == expected, f"Test 1 failed: {sorted(names ^ expected)}"
+        assert count == len(expected), "Test 1 failed: wrong number of entries"
+        assert 'dirB/file1.txt' not in names, "Test 1 failed: the pruned subtree was archived"
+        assert 'dirA/file0.log' in names and 'dirA/file1.log' not in names, "Test 1 failed: wrong rules applied"
+
+    if 1:  # Test 2: A gzipped tar archive compressed by several threads, with small chunks.
+        archive(pylematch, tmp_path / 'out.tar.gz', workers=3, bufsize=64, prefix='release')
+
+        with tarfile.open(tmp_path / 'out.tar.gz') as tar:
+            names = set(tar.getnames())
+            content = tar.extractfile('release/dirA/file0.log').read()
+
+        assert names == {f'release/{name}' for name in expected}, f"Test 2 failed: {sorted(names)}"
+        assert content == b'This is file0.log\n', "Test 2 failed: wrong file content"
+
+        archive(pylematch, tmp_path / 'single.tar.gz', level=1)
+
+        with tarfile.open(tmp_path / 'single.tar.gz') as tar:
+            assert set(tar.getnames()) == expected, "Test 2 failed: wrong single-threaded archive"
+
+    if 1:  # Test 3: A zip archive with only the matched paths.
+        count = archive(pylematch, tmp_path / 'out.zip', exclude=False)
+        expected = {path.rstrip('/') for path, is_matched in pylematch.matched() if is_matched}
+
+        with zipfile.ZipFile(tmp_path / 'out.zip') as zf:
+            names = {name.rstrip('/') for name in zf.namelist()}
+            content = zf.read('file1.log')
+
+        assert names == expected, f"Test 3 failed: {sorted(names ^ expected)}"
+        assert content == b'This is file1.log\n', "Test 3 failed: wrong file content"
+
+    if 1:  # Test 4: The archive is never added to itself.
+        archive(pylematch, root / 'self.tar')
+
+        with tarfile.open(root / 'self.tar') as tar:
+            assert 'self.tar' not in tar.getnames(), "Test 4 failed: the archive contains itself"
+
+    if 1:  # Test 5: Special files are left out, and followed directory links are stored as directories.
+        if not hasattr(os, 'mkfifo') or not hasattr(socket, 'AF_UNIX'):
+            pytest.skip('FIFOs or Unix sockets are not available')
+
+        os.mkfifo(root / 'fifo')
+        server = socket.socket(socket.AF_UNIX)
+        server.bind(str(root / 'socket'))
+        (tmp_path / 'outside').mkdir()
+        (tmp_path / 'outside/data.txt').write_text('Outside the tree\n')
+        os.symlink(tmp_path / 'outside', root / 'link')
+
+        try:
+            pylematch = Pylematch(root=root, follow_symlinks=True)
+            archive(pylematch, tmp_path / 'special.tar')
+            archive(pylematch, tmp_path / 'special.zip')
+        finally:
+            server.close()
+
+        with tarfile.open(tmp_path / 'special.tar') as tar:
+            members = {member.name: member for member in tar.getmembers()}
+
+        assert 'fifo' not in members and 'socket' not in members, "Test 5 failed: a special file was archived"
+        assert members['link'].isdir() and 'link/data.txt' in members, "Test 5 failed: wrong followed link"
+
+        with zipfile.ZipFile(tmp_path / 'special.zip') as zf:
+            names = zf.namelist()
+
+        assert 'fifo' not in names and 'socket' not in names, "Test 5 failed: a special file was zipped"
+        assert zf.getinfo('link/').is_dir() and 'link/data.txt' in names, "Test 5 failed: wrong zipped link"
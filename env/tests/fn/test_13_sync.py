@@ -0,0 +1,98 @@
+"""
+Filtered tree copy and synchronization test.
+"""
+
+import os
+
+import pytest
+
+from env.common.mktree import mktree
+from pylematch.pylematch import Pylematch
+from pylematch.sync import copy_tree, sync
+
+
+def listing(path):
+    return {
+        os.path.relpath(os.path.join(dirpath, name), path)
+        for dirpath, dirnames, filenames in os.walk(path)
+        for name in dirnames + filenames
+    }
+
+
+def test(tmp_path):
+    root = tmp_path / 'root'
+    dst = tmp_path / 'dst'
+    mktree(path=root, dir_number=2, file_number=2, depth=3)
+
+    (root / '.pylematch').write_text('*.log\n**/*.log\ndirB/\n')
+    (root / 'dirA/.pylematch').write_text('!file0.log\n')
+
+    pylematch = Pylematch(root=root)
+    expected = listing(root) - {
+        path.rstrip('/')
+        for path in listing(root)
+        if pylematch.is_matched(root / path) or path.startswith('dirB' + os.sep)
+    }
+
+    if 1:  # Test 1: Only the selected paths are copied, with their content and modification time.
+        stats = copy_tree(pylematch, dst)
+
+        assert listing(dst) == expected, f"Test 1 failed: {sorted(listing(dst) ^ expected)}"
+        assert (dst / 'dirA/file0.log').read_text() == 'This is file0.log\n', "Test 1 failed: wrong content"
+        assert os.stat(dst / 'file0.txt').st_mtime_ns == os.stat(root / 'file0.txt').st_mtime_ns, "Test 1 failed"
+        assert stats['copied'] == len([path for path in expected if os.path.isfile(root / path)]), "Test 1 failed"
+
+    if 1:  # Test 2: Unchanged files are skipped.
+        (root / 'file1.txt').write_text('Changed content, another size')
+
+        stats = copy_tree(pylematch, dst, workers=2)
+
+        assert stats['copied'] == 1, f"Test 2 failed: {stats}"
+        assert (dst / 'file1.txt').read_text() == 'Changed content, another size', "Test 2 failed: not copied"
+
+    if 1:  # Test 3: Synchronization deletes paths that are no longer selected.
+        (dst / 'stale.txt').write_text('Not in the source')
+        (root / '.pylematch').write_text('*.log\n**/*.log\ndirB/\ndirA/dirA/**\n')
+
+        stats = sync(Pylematch(root=root), dst)
+        expected = {path for path in expected if not path.startswith(os.path.join('dirA', 'dirA', ''))}
+
+        assert listing(dst) == expected, f"Test 3 failed: {sorted(listing(dst) ^ expected)}"
+        assert stats['deleted'] > 1 and stats['copied'] == 1, f"Test 3 failed: {stats}"  # `.pylematch` changed
+
+    if 1:  # Test 4: The destination is never copied into itself.
+        copy_tree(Pylematch(root=root), root / 'out')
+
+        assert not (root / 'out/out').exists(), "Test 4 failed: the destination was copied into itself"
+
+    if 1:  # Test 5: A link left in the destination is replaced, not written through.
+        (root / 'swap.txt').write_text('Now a regular file\n')
+        os.rename(root / 'swap.txt', root / 'swap.tmp')
+        os.symlink(tmp_path / 'victim.txt', root / 'swap.txt')
+        (tmp_path / 'victim.txt').write_text('Outside the destination\n')
+        sync(Pylematch(root=root), dst)
+
+        os.unlink(root / 'swap.txt')
+        os.rename(root / 'swap.tmp', root / 'swap.txt')
+        sync(Pylematch(root=root), dst)
+
+        assert not os.path.islink(dst / 'swap.txt'), "Test 5 failed: the link was kept"
+        assert (dst / 'swap.txt').read_text() == 'Now a regular file\n', "Test 5 failed: wrong content"
+        assert (tmp_path / 'victim.txt').read_text() == 'Outside the destination\n', \
+            "Test 5 failed: a file outside the destination was overwritten"
+
+    if 1:  # Test 6: Special files are left out, and followed directory links are copied as directories.
+        if not hasattr(os, 'mkfifo'):
+            pytest.skip('FIFOs are not available')
+
+        os.mkfifo(root / 'dirA/fifo')
+        (tmp_path / 'outside').mkdir()
+        (tmp_path / 'outside/data.txt').write_text('Outside the tree\n')
+        os.symlink(tmp_path / 'outside', root / 'link')
+
+        copy_tree(Pylematch(root=root, follow_symlinks=True), tmp_path / 'followed')
+
+        assert not os.path.lexists(tmp_path / 'followed/dirA/fifo'), "Test 6 failed: a FIFO was copied"
+        assert not os.path.islink(tmp_path / 'followed/link'), "Test 6 failed: a followed link was copied as is"
+        assert (tmp_path / 'followed/link/data.txt').read_text() == 'Outside the tree\n', "Test 6 failed"
+        assert os.listdir(tmp_path / 'outside') == ['data.txt'], "Test 6 failed: files were written through the link"
@@ -0,0 +1,59 @@
+"""
+Content fingerprint test.
+"""
+
+import os
+
+import pytest
+
+from env.common.mktree import mktree
+from pylematch.pylematch import Pylematch
+from pylematch.fingerprint import fingerprint
+
+
+def test(tmp_path):
+    mktree(path=tmp_path, dir_number=2, file_number=2, depth=3)
+    (tmp_path / '.pylematch').write_text('**\n!**/')  # all files
+    (tmp_path / 'dirB/.pylematch').write_text('!*.log')
+    (tmp_path / 'empty.txt').write_text('')
+
+    digests = fingerprint(Pylematch(root=tmp_path))
+
+    if 1:  # Test 1: Fingerprints are stable and do not depend on the hashing strategy.
+        assert digests == fingerprint(Pylematch(root=tmp_path), workers=1), "Test 1 failed: unstable digests"
+        assert digests == fingerprint(Pylematch(root=tmp_path), mmap_threshold=0), "Test 1 failed: mmap differs"
+        assert set(digests) == {'', *(path for path, _ in Pylematch(root=tmp_path).matched() if path.endswith('/'))}
+
+    if 1:  # Test 2: A change only affects the digests of the directories above it.
+        (tmp_path / 'dirA/dirB/file0.txt').write_text('Changed')
+        changed = fingerprint(Pylematch(root=tmp_path))
+
+        differ = {path for path in digests if digests[path] != changed[path]}
+        assert differ == {'', 'dirA/', 'dirA/dirB/'}, f"Test 2 failed: {sorted(differ)}"
+
+    if 1:  # Test 3: Ignored files do not affect the fingerprint.
+        (tmp_path / 'dirB/file0.log').write_text('Ignored change')
+
+        assert fingerprint(Pylematch(root=tmp_path)) == changed, "Test 3 failed: an ignored file changed the digest"
+
+    if 1:  # Test 4: Cached digests are reused for files with the same size and modification time.
+        cache = {}
+        fingerprint(Pylematch(root=tmp_path), cache=cache)
+
+        path = tmp_path / 'dirA/file0.txt'
+        st = os.stat(path)
+        path.write_text('This is FILE0.txt\n')  # same size
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+        assert fingerprint(Pylematch(root=tmp_path), cache=cache) == changed, "Test 4 failed: the cache was not used"
+        assert fingerprint(Pylematch(root=tmp_path)) != changed, "Test 4 failed: the change was not detected"
+
+    if 1:  # Test 5: Special files are recorded by their type, without being read.
+        if not hasattr(os, 'mkfifo'):
+            pytest.skip('FIFOs are not available')
+
+        digests = fingerprint(Pylematch(root=tmp_path))
+        os.mkfifo(tmp_path / 'dirA/fifo')
+
+        assert fingerprint(Pylematch(root=tmp_path), workers=1)['dirA/'] != digests['dirA/'], \
+            "Test 5 failed: the FIFO is not recorded"
@@ -0,0 +1,73 @@
+"""
+Non-blocking scans with asyncio.
+"""
+
+import asyncio
+
+from env.common.mktree import mktree
+from pylematch.pylematch import Pylematch
+
+
+def test(tmp_path):
+    mktree(path=tmp_path, dir_number=3, file_number=2, depth=3)
+    (tmp_path / '.pylematch').write_text('**/*.log\ndirB/\n')
+    (tmp_path / 'dirA/.pylematch').write_text('!file0.log\n*/*.txt\n')
+
+    expected = dict(Pylematch(root=tmp_path).matched())
+
+    if 1:  # Test 1: Streaming asynchronously yields the same results.
+        async def collect():
+            return {path: is_matched async for path, is_matched in Pylematch(root=tmp_path).awalk(concurrency=3)}
+
+        output = asyncio.run(collect())
+        assert output == expected, f"Test 1 failed: {sorted(set(output.items()) ^ set(expected.items()))}"
+
+    if 1:  # Test 2: An asynchronously scanned instance answers queries without another scan.
+        pylematch = asyncio.run(Pylematch.scan_async(tmp_path))
+
+        assert list(pylematch.matched()) == list(Pylematch(root=tmp_path).matched()), \
+            "Test 2 failed: wrong results or order"
+        assert pylematch.is_matched(tmp_path / 'dirA/dirB/file1.txt') is True, "Test 2 failed: wrong verdict"
+        assert len(pylematch.get_rules(str(tmp_path / 'dirA/dirC'))) == 4, "Test 2 failed: wrong rules"
+
+        pylematch = asyncio.run(Pylematch.scan_async(tmp_path, concurrency=3, aggregate=True))
+        expected_summary = Pylematch(root=tmp_path, aggregate=True).summary(tmp_path / 'dirA')
+        assert pylematch.summary(tmp_path / 'dirA') == expected_summary, "Test 2 failed: the options are not used"
+
+    if 1:  # Test 3: The walk can be stopped early, the remaining directories are never listed.
+        listed = []
+
+        async def stop_early():
+            pylematch = Pylematch(root=tmp_path)
+            original = pylematch._list_dir
+
+            def _list_dir(dirpath, *args):
+                listed.append(dirpath)
+                return original(dirpath, *args)
+
+            pylematch._list_dir = _list_dir
+
+            walker = pylematch.awalk(concurrency=1)
+            async for _ in walker:
+                break
+            await walker.aclose()
+
+        asyncio.run(stop_early())
+        assert len(listed) <= 2, f"Test 3 failed: {len(listed)} directories listed"
+
+    if 1:  # Test 4: The event loop keeps running while the tree is scanned.
+        async def ticker(stop):
+            ticks = 0
+            while not stop.is_set():
+                await asyncio.sleep(0)
+                ticks += 1
+            return ticks
+
+        async def scan():
+            stop = asyncio.Event()
+            task = asyncio.ensure_future(ticker(stop))
+            await Pylematch.scan_async(tmp_path, concurrency=2)
+            stop.set()
+            return await task
+
+        assert asyncio.run(scan()) > 0, "Test 4 failed: the event loop was blocked"
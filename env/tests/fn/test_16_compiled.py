@@ -0,0 +1,75 @@
+"""
+Compiled rule set serialization test.
+"""
+
+import json
+import pickle
+
+import pytest
+
+from env.common.mktree import mktree
+from pylematch.pylematch import Pylematch
+
+
+def test(tmp_path):
+    root = tmp_path / 'root'
+    mktree(path=root, dir_number=2, file_number=2, depth=3)
+    (root / '.pylematch').write_text('**/*.log\ndirB/\n\\#*[!0-9]?.txt\n')
+    (root / 'dirA/.pylematch').write_text('!file0.log\n*/*.txt\n')
+    (root / 'dirB/dirA/.pylematch').write_text('**\n')
+
+    expected = dict(Pylematch(root=root).matched())
+
+    if 1:  # Test 1: Composed regexes are the same in every instance.
+        first = [rule.regex for rules in dict(Pylematch(root=root).get_all_rules()).values() for rule in rules]
+        second = [rule.regex for rules in dict(Pylematch(root=root).get_all_rules()).values() for rule in rules]
+
+        assert first == second, "Test 1 failed: the composed regexes are not deterministic"
+
+    if 1:  # Test 2: Loading an export reuses the compiled rules and gives the same results.
+        Pylematch(root=root).dump_rules(tmp_path / 'rules.json')
+        pylematch = Pylematch(root=root, compiled=str(tmp_path / 'rules.json'))
+
+        assert dict(pylematch.matched()) == expected, "Test 2 failed: wrong results"
+        assert all(rule._rule is not None for rule in pylematch.get_rules(str(root / 'dirA/dirA'))), "Test 2 failed"
+
+    if 1:  # Test 3: A changed protocol file is parsed again.
+        compiled = json.loads((tmp_path / 'rules.json').read_text())
+        (root / 'dirB/dirA/.pylematch').write_text('*.txt\n')
+
+        pylematch = Pylematch(root=root, compiled=compiled)
+        rules = pylematch.get_rules(str(root / 'dirB/dirA'))
+
+        assert [rule.pattern for rule in rules] == ['**/*.log', 'dirB/', '\\#*[!0-9]?.txt', '*.txt'], "Test 3 failed"
+        assert dict(pylematch.matched()) == dict(Pylematch(root=root).matched()), "Test 3 failed: wrong results"
+
+    if 1:  # Test 4: An unsupported export is rejected.
+        compiled['version'] += 1
+
+        with pytest.raises(ValueError):
+            Pylematch(root=root, compiled=compiled)
+
+    if 1:  # Test 5: Instances and rules pickle without their compiled regexes.
+        pylematch = Pylematch(root=root)
+        pylematch.is_matched(root / 'file0.txt')
+
+        clone = pickle.loads(pickle.dumps(pylematch))
+        rule = clone.get_rules(str(root))[0]
+
+        assert rule._compiled is None and rule.regex == pylematch.get_rules(str(root))[0].regex, "Test 5 failed"
+        assert dict(clone.matched()) == dict(pylematch.matched()), "Test 5 failed: wrong results"
+
+    if 1:  # Test 6: Exports of profiles are reused, and exported files are subject to the limits.
+        (root / '.shipignore').write_text('**/*.log\n')
+        profiles = {'ship': '.shipignore', 'all': '.pylematch'}
+
+        Pylematch(root=root, profiles=profiles).dump_rules(tmp_path / 'profiles.json')
+        pylematch = Pylematch(root=root, profiles=profiles, compiled=str(tmp_path / 'profiles.json'))
+
+        assert pylematch._precompiled, "Test 6 failed: the export is ignored"
+        assert dict(pylematch.masks()) == dict(Pylematch(root=root, profiles=profiles).masks()), \
+            "Test 6 failed: wrong results"
+
+        pylematch = Pylematch(root=root, compiled=str(tmp_path / 'rules.json'), max_lines=1)
+        assert [rule.pattern for rule in pylematch.get_rules(str(root))] == [], \
+            "Test 6 failed: a file over the line limit is loaded"
@@ -0,0 +1,57 @@
+"""
+Segment engine equivalence test.
+"""
+
+import random
+
+from env.common.mktree import mktree
+from pylematch.pylematch import Pylematch
+
+PATTERNS = [
+    '*', '*/', '**', '**/', '**/**', '**/**/', '*/*', '*/*/', '**/*.txt', '**/dirA/**', '**/dirA/**/file0.txt',
+    'dirA/**', 'dirA/**/', 'dirA/**/file0.txt', 'dirA/**file0.txt', 'dirA/*', 'dirA/*/', 'foo**bar', 'dir*/**',
+    'file?.txt', 'file[0-9].txt', 'file[!0-9].txt', 'dir[!/]', 'dir[A-C]/**/dir[!B]/', '\\#*', 'file\\*\\*.txt',
+    '!**/*.log', '/dirA//dirB/', '***/file0.log', 'dir?/dir?/*.txt', '**/**/**/file1.log', 'dirA/dirB/file0.txt',
+]
+
+
+def test(tmp_path):
+    mktree(path=tmp_path, dir_number=3, file_number=2, depth=4)
+    (tmp_path / 'dirA/.pylematch').write_text('dirB/**\n!*.log\n')
+
+    relpaths = [path for path, _ in Pylematch(root=tmp_path).matched()]
+    regex = Pylematch(root=tmp_path)
+    segment = Pylematch(root=tmp_path, engine='segment')
+
+    if 1:  # Test 1: Every rule gives the same result with both engines, for every path.
+        for context in ('.', 'dirA', 'dirA/dirB'):
+            for pattern in PATTERNS:
+                expected_rule = regex.PylematchRule(pattern, context=context, parent=regex)
+                output_rule = segment.PylematchRule(pattern, context=context, parent=segment)
+
+                for relpath in relpaths:
+                    expected, output = expected_rule.match(relpath), output_rule.match(relpath)
+                    assert output == expected, f"Test 1 failed for '{pattern}' in '{context}' on '{relpath}'"
+
+    if 1:  # Test 2: Random rule sets give the same verdicts with both engines.
+        rand = random.Random(0)
+
+        for _ in range(20):
+            (tmp_path / '.pylematch').write_text('\n'.join(rand.sample(PATTERNS, 5)))
+
+            expected = dict(Pylematch(root=tmp_path).matched())
+            output = dict(Pylematch(root=tmp_path, engine='segment').matched())
+            assert output == expected, f"Test 2 failed for {(tmp_path / '.pylematch').read_text()!r}"
+
+    if 1:  # Test 3: Patterns with several `**` are matched segment by segment, others fall back to the regex.
+        rule = segment.PylematchRule('**/a/**/b/**/c', context='.', parent=segment)
+        rule.match('x')
+        assert rule._compiled is None, "Test 3 failed: the regex was used"
+
+        rule = segment.PylematchRule('foo**bar', context='.', parent=segment)
+        rule.match('x')
+        assert rule._compiled is not None, "Test 3 failed: the pattern is not supported by the segment engine"
+
+        rule = segment.PylematchRule('**/a/**/b/**/c', context='.', parent=segment)
+        assert rule.match('z/a/y/b/' + 'x/' * 2000 + 'c'), "Test 3 failed: wrong match on a deep path"
+        assert not rule.match('z/a/y/b/' + 'x/' * 2000 + 'd'), "Test 3 failed: wrong match on a deep path"
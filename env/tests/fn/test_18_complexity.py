@@ -0,0 +1,81 @@
+"""
+Pattern complexity guard and scan time budget test.
+"""
+
+import warnings
+
+import pytest
+
+from env.common.mktree import mktree
+from pylematch.pylematch import Pylematch
+
+
+def test(tmp_path):
+    mktree(path=tmp_path, dir_number=2, file_number=2, depth=3)
+    (tmp_path / '.pylematch').write_text('*.log\n**/dir*/**/dir*/**/file?.txt\n')
+
+    if 1:  # Test 1: Complexity estimates.
+        pylematch = Pylematch(root=tmp_path)
+        segment = Pylematch(root=tmp_path, engine='segment')
+
+        test_cases = {
+            'file0.txt': 1,
+            '*.log': 1,
+            '**/dirA/**/file0.txt': 2,
+            '**/dir*/**/dir*/**/file?.txt': 5,
+            '*a*b*': 3,
+        }
+
+        for pattern, expected in test_cases.items():
+            output = pylematch.PylematchRule(pattern, context='.', parent=pylematch).complexity
+            assert output == expected, f"Test 1 failed for '{pattern}': Expected '{expected}', got '{output}'"
+
+        output = segment.PylematchRule('**/dir*/**/dir*/**/file?.txt', context='.', parent=segment).complexity
+        assert output == 1, f"Test 1 failed for the segment engine: got '{output}'"
+
+    if 1:  # Test 2: Rules above the threshold are reported, and kept by default.
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            pylematch = Pylematch(root=tmp_path, max_complexity=3)
+            rules = pylematch.get_rules(str(tmp_path))
+
+        assert len(rules) == 2, "Test 2 failed: the rule was dropped"
+        assert any('**/dir*/**/dir*/**/file?.txt' in str(warning.message) for warning in caught), "Test 2 failed"
+
+    if 1:  # Test 3: Rules above the threshold can be dropped.
+        with warnings.catch_warnings(record=True):
+            warnings.simplefilter('always')
+            pylematch = Pylematch(root=tmp_path, max_complexity=3, on_complex='skip')
+
+            assert [rule.pattern for rule in pylematch.get_rules(str(tmp_path))] == ['*.log'], "Test 3 failed"
+            assert pylematch.is_matched(tmp_path / 'dirA/dirB/dirA/file0.txt') is False, "Test 3 failed"
+
+    if 1:  # Test 4: Rules above the threshold can be rejected.
+        pylematch = Pylematch(root=tmp_path, max_complexity=3, on_complex='error')
+        for _ in range(2):  # an aborted scan is not taken for a complete one
+            with pytest.raises(ValueError, match='estimated complexity of 5'):
+                pylematch.matched()
+
+        with pytest.raises(ValueError):
+            Pylematch(root=tmp_path, on_complex='ignore')
+
+    if 1:  # Test 5: A scan over its time budget is aborted with a report of the slowest rule.
+        pylematch = Pylematch(root=tmp_path, time_budget=0)
+        for _ in range(2):
+            with pytest.raises(TimeoutError, match='The slowest rule is'):
+                pylematch.matched()
+
+        with pytest.raises(TimeoutError):
+            list(Pylematch(root=tmp_path, time_budget=0).walk())
+
+        pylematch = Pylematch(root=tmp_path, time_budget=60)
+        pylematch.scan(tmp_path / 'dirA')
+        pylematch._time_budget = 0
+
+        with pytest.raises(TimeoutError):
+            pylematch.matched()
+
+        assert pylematch.is_matched(tmp_path / 'dirA/file0.txt') is not None, \
+            "Test 5 failed: an aborted scan dropped the results of a subtree scan"
+
+        assert dict(Pylematch(root=tmp_path, time_budget=60).matched()), "Test 5 failed: a scan within budget failed"
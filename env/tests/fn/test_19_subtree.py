@@ -0,0 +1,61 @@
+"""
+Subtree-scoped scans test.
+"""
+
+import pytest
+
+from env.common.mktree import mktree
+from pylematch.pylematch import Pylematch
+
+
+def test(tmp_path):
+    mktree(path=tmp_path, dir_number=3, file_number=2, depth=4)
+    (tmp_path / '.pylematch').write_text('**/*.log\ndirB/\n')
+    (tmp_path / 'dirA/.pylematch').write_text('!file0.log\n*/*.txt\n')
+    (tmp_path / 'dirA/dirB/.pylematch').write_text('**\n!dirA/**/')
+    (tmp_path / 'dirB/.pylematch').write_text('file1.txt')
+
+    full = dict(Pylematch(root=tmp_path).matched())
+
+    if 1:  # Test 1: A subtree scan gives the same results as the full scan restricted to the subtree.
+        for subpath in ('dirA/dirB', 'dirA', 'dirC/dirA/dirB', 'dirB'):
+            expected = {path: is_matched for path, is_matched in full.items() if path.startswith(subpath + '/')}
+            output = Pylematch(root=tmp_path).scan(tmp_path / subpath)
+
+            assert output == expected, f"Test 1 failed for '{subpath}': {sorted(set(output) ^ set(expected))}"
+
+    if 1:  # Test 2: Only the protocol files along the ancestor path and inside the subtree are read.
+        pylematch = Pylematch(root=tmp_path)
+        parsed = []
+        original = pylematch._parse_file
+
+        def _parse_file(directory, filepath):
+            parsed.append(filepath)
+            return original(directory, filepath)
+
+        pylematch._parse_file = _parse_file
+        pylematch.scan(tmp_path / 'dirA/dirB')
+
+        assert sorted(parsed) == sorted([
+            str(tmp_path / '.pylematch'),
+            str(tmp_path / 'dirA/.pylematch'),
+            str(tmp_path / 'dirA/dirB/.pylematch'),
+        ]), f"Test 2 failed: {parsed}"
+
+    if 1:  # Test 3: Queries inside a scanned subtree do not scan the whole tree.
+        pylematch = Pylematch(root=tmp_path)
+        pylematch.scan(tmp_path / 'dirA/dirB')
+
+        assert pylematch.is_matched(tmp_path / 'dirA/dirB/dirC/file0.txt') is True, "Test 3 failed: wrong verdict"
+        assert pylematch.is_matched(tmp_path / 'dirA/dirB/dirA/dirB') is False, "Test 3 failed: wrong verdict"
+        assert not pylematch._loaded, "Test 3 failed: the whole tree was scanned"
+
+        assert pylematch.is_matched(tmp_path / 'dirB/file1.txt') is True, "Test 3 failed: wrong verdict outside"
+        assert dict(pylematch.matched()) == full, "Test 3 failed: wrong results after the full scan"
+
+    if 1:  # Test 4: Subpaths outside the root are rejected.
+        with pytest.raises(ValueError):
+            Pylematch(root=tmp_path / 'dirA').scan(tmp_path / 'dirB')
+
+        with pytest.raises(ValueError):
+            Pylematch(root=tmp_path).scan(tmp_path / 'file0.txt')
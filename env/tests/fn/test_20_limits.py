@@ -0,0 +1,59 @@
+"""
+Traversal limits test.
+"""
+
+import os
+
+from env.common.mktree import mktree
+from pylematch.pylematch import Pylematch
+
+
+def test(tmp_path):
+    mktree(path=tmp_path, dir_number=3, file_number=2, depth=4)
+    (tmp_path / '.pylematch').write_text('**/*.log\ndirB/\n')
+
+    full = dict(Pylematch(root=tmp_path).matched())
+
+    if 1:  # Test 1: A depth limit keeps the shallow results and lists the directories left out.
+        pylematch = Pylematch(root=tmp_path, max_depth=2)
+        output = dict(pylematch.matched())
+        expected = {path: is_matched for path, is_matched in full.items() if path.rstrip(os.sep).count(os.sep) < 2}
+
+        assert output == expected, f"Test 1 failed: {sorted(set(output) ^ set(expected))}"
+        assert pylematch.truncated, "Test 1 failed: the scan is not reported as truncated"
+        assert sorted(pylematch.unexplored) == sorted(
+            str(tmp_path / path.rstrip(os.sep)) for path in expected if path.count(os.sep) == 2
+        ), f"Test 1 failed: {pylematch.unexplored}"
+
+    if 1:  # Test 2: An entry budget stops the scan with exactly that many results.
+        pylematch = Pylematch(root=tmp_path, max_entries=25)
+        output = dict(pylematch.matched())
+
+        assert len(output) == 25, f"Test 2 failed: {len(output)} results"
+        assert all(full[path] == is_matched for path, is_matched in output.items()), "Test 2 failed: wrong verdicts"
+        assert pylematch.unexplored, "Test 2 failed: no unexplored directories"
+
+        # Every path left out lies in an unexplored directory
+        for path in set(full) - set(output):
+            abspath = str(tmp_path / path.rstrip(os.sep))
+            assert any(abspath.startswith(directory + os.sep) or abspath == directory
+                       for directory in pylematch.unexplored), f"Test 2 failed: '{path}' is lost"
+
+    if 1:  # Test 3: Streaming walks honour the limits as well.
+        pylematch = Pylematch(root=tmp_path, max_entries=10)
+
+        assert len(list(pylematch.walk())) == 10, "Test 3 failed: the budget is not applied"
+        assert pylematch.truncated, "Test 3 failed: the walk is not reported as truncated"
+
+    if 1:  # Test 4: An expired timeout returns the first directory rather than nothing.
+        pylematch = Pylematch(root=tmp_path, timeout=0)
+        output = dict(pylematch.matched())
+
+        assert len(output) == len(os.listdir(tmp_path)), f"Test 4 failed: {len(output)} results"
+        assert len(pylematch.unexplored) == 3, f"Test 4 failed: {pylematch.unexplored}"
+
+    if 1:  # Test 5: Without limits, nothing is left out.
+        pylematch = Pylematch(root=tmp_path, max_depth=10, max_entries=10 ** 6, timeout=60)
+
+        assert dict(pylematch.matched()) == full, "Test 5 failed: wrong results"
+        assert not pylematch.truncated and pylematch.unexplored == [], "Test 5 failed: the scan is truncated"
@@ -0,0 +1,60 @@
+"""
+Symlink- and mount-aware traversal test.
+"""
+
+import os
+
+import pytest
+
+from env.common.mktree import mktree
+from pylematch.pylematch import Pylematch
+
+
+def below(output, directory):
+    return [path for path in output if path.startswith(directory) and path != directory]
+
+
+def test(tmp_path):
+    if not hasattr(os, 'symlink'):
+        pytest.skip('symbolic links are not supported')
+
+    root = tmp_path / 'root'
+    mktree(path=root, dir_number=2, file_number=1, depth=2)
+    mktree(path=tmp_path / 'outside', dir_number=1, file_number=1, depth=1)
+    (root / '.pylematch').write_text('**/*.log\n')
+
+    os.symlink(tmp_path / 'outside', root / 'dirA/link')
+    os.symlink(root, root / 'dirB/loop')
+    os.symlink(root / 'dirB/dirA', root / 'dirA/shortcut')  # sorted before its target
+
+    if 1:  # Test 1: Symlinked directories are reported but not followed by default.
+        output = dict(Pylematch(root=root).matched())
+
+        assert 'dirA/link/' in output and 'dirB/loop/' in output, "Test 1 failed: the links are not reported"
+        assert not below(output, 'dirA/link/') + below(output, 'dirB/loop/'), "Test 1 failed: the links are followed"
+
+    if 1:  # Test 2: Followed symlinks are traversed, and loops end.
+        pylematch = Pylematch(root=root, follow_symlinks=True)
+        output = dict(pylematch.matched())
+
+        assert output['dirA/link/dirA/file0.log'] is True, "Test 2 failed: the link is not followed"
+        assert output['dirA/link/dirA/file0.txt'] is False, "Test 2 failed: wrong verdict"
+        assert 'dirB/loop/' in output and not below(output, 'dirB/loop/'), "Test 2 failed: the loop is followed"
+        assert 'dirA/shortcut/file0.txt' in output and 'dirB/dirA/file0.txt' in output, \
+            "Test 2 failed: a directory reached by two paths is listed once"
+
+    if 1:  # Test 3: Streaming walks follow symlinks the same way.
+        output = dict(Pylematch(root=root, follow_symlinks=True).walk())
+
+        assert output == dict(Pylematch(root=root, follow_symlinks=True).matched()), "Test 3 failed: wrong results"
+
+    if 1:  # Test 4: Directories on another filesystem are not descended into.
+        if not os.path.isdir('/proc') or os.stat('/proc').st_dev == os.stat(root).st_dev:
+            pytest.skip('no other filesystem available')
+
+        os.symlink('/proc', root / 'proc')
+        output = dict(Pylematch(root=root, follow_symlinks=True, same_filesystem=True).matched())
+
+        assert 'proc/' in output, "Test 4 failed: the mount point is not reported"
+        assert not below(output, 'proc/'), "Test 4 failed: the mount point is crossed"
+        assert output['dirA/link/dirA/file0.log'] is True, "Test 4 failed: the same filesystem is not traversed"
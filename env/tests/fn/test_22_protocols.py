@@ -0,0 +1,60 @@
+"""
+Multiple protocol file names test.
+"""
+
+from env.common.mktree import mktree
+from pylematch.pylematch import Pylematch
+
+
+def test(tmp_path):
+    mktree(path=tmp_path, dir_number=2, file_number=2, depth=2)
+    (tmp_path / '.gitignore').write_text('**/*.log\ndirB/\n')
+    (tmp_path / '.dockerignore').write_text('**/file1.*\n!dirB/\n')
+    (tmp_path / 'dirA/.gitignore').write_text('*.txt\n')
+
+    protocols = ['.gitignore', '.dockerignore']
+
+    if 1:  # Test 1: Protocol files are layered in the given order, the later names take precedence.
+        pylematch = Pylematch(root=tmp_path, protocol=protocols)
+
+        assert pylematch.is_matched(tmp_path / 'dirA/file0.log') is True, "Test 1 failed: wrong verdict"
+        assert pylematch.is_matched(tmp_path / 'dirB') is False, "Test 1 failed: '!dirB/' does not take precedence"
+        assert pylematch.is_matched(tmp_path / 'dirA/file0.txt') is True, "Test 1 failed: nested rules are lost"
+
+        reverse = Pylematch(root=tmp_path, protocol=protocols[::-1])
+        assert reverse.is_matched(tmp_path / 'dirB') is True, "Test 1 failed: '.gitignore' does not take precedence"
+
+    if 1:  # Test 2: The verdict of each name matches a separate instance using only that name.
+        pylematch = Pylematch(root=tmp_path, protocol=protocols)
+        separate = {protocol: dict(Pylematch(root=tmp_path, protocol=protocol).matched()) for protocol in protocols}
+
+        for path, verdicts in pylematch.walk(per_protocol=True):
+            expected = {protocol: separate[protocol][path] for protocol in protocols}
+            assert verdicts == expected, f"Test 2 failed for '{path}': {verdicts}"
+
+            assert pylematch.verdicts(tmp_path / path) == expected, f"Test 2 failed for '{path}': on demand"
+
+    if 1:  # Test 3: All protocol files are read in a single traversal.
+        pylematch = Pylematch(root=tmp_path, protocol=protocols)
+        listed = []
+        original = pylematch._list_dir
+
+        def _list_dir(dirpath, *args):
+            listed.append(dirpath)
+            return original(dirpath, *args)
+
+        pylematch._list_dir = _list_dir
+        list(pylematch.walk(per_protocol=True))
+
+        assert len(listed) == len(set(listed)), "Test 3 failed: directories are listed several times"
+
+    if 1:  # Test 4: Paths outside the root have no verdicts, and compiled rules keep their protocol.
+        pylematch = Pylematch(root=tmp_path / 'dirA', protocol=protocols)
+        assert pylematch.verdicts(tmp_path / 'dirB') is None, "Test 4 failed: a path outside the root"
+
+        pylematch = Pylematch(root=tmp_path, protocol=protocols)
+        pylematch.dump_rules(tmp_path / 'rules.json')
+        compiled = Pylematch(root=tmp_path, protocol=protocols, compiled=tmp_path / 'rules.json')
+
+        assert dict(compiled.walk(per_protocol=True)) == dict(pylematch.walk(per_protocol=True)), \
+            "Test 4 failed: wrong verdicts with compiled rules"
@@ -0,0 +1,68 @@
+"""
+Multi-profile evaluation test.
+"""
+
+import pytest
+
+from env.common.mktree import mktree
+from pylematch.pylematch import Pylematch
+
+
+def test(tmp_path):
+    mktree(path=tmp_path, dir_number=2, file_number=2, depth=3)
+    (tmp_path / '.shipignore').write_text('**/*.log\n')
+    (tmp_path / 'dirA/.shipignore').write_text('!file0.log\n')
+    (tmp_path / '.backupignore').write_text('dirB/\n')
+
+    profiles = {'ship': '.shipignore', 'lint': ['**/file1.*', '!dirA/dirB/'], 'backup': '.backupignore'}
+
+    separate = {
+        'ship': dict(Pylematch(root=tmp_path, protocol='.shipignore').matched()),
+        'backup': dict(Pylematch(root=tmp_path, protocol='.backupignore').matched()),
+    }
+    (tmp_path / '.lint').write_text('\n'.join(profiles['lint']))
+    separate['lint'] = dict(Pylematch(root=tmp_path, protocol='.lint').matched())
+    (tmp_path / '.lint').unlink()
+    del separate['lint']['.lint']
+
+    if 1:  # Test 1: Every bit of the masks is the verdict of a separate instance for that profile.
+        pylematch = Pylematch(root=tmp_path, profiles=profiles)
+        masks = dict(pylematch.masks())
+
+        assert pylematch.profiles == ('ship', 'lint', 'backup'), "Test 1 failed: wrong profiles"
+        assert set(masks) == set(separate['ship']), "Test 1 failed: wrong paths"
+
+        for path, mask in masks.items():
+            for index, name in enumerate(pylematch.profiles):
+                assert bool(mask >> index & 1) == separate[name][path], f"Test 1 failed for '{path}' in '{name}'"
+
+    if 1:  # Test 2: A path is matched if any profile matches it.
+        pylematch = Pylematch(root=tmp_path, profiles=profiles)
+        expected = {path for path in separate['ship'] if any(separate[name][path] for name in separate)}
+
+        assert set(pylematch.matched_by_any()) == expected, "Test 2 failed: wrong paths"
+        assert dict(pylematch.matched()) == {path: path in expected for path in masks}, "Test 2 failed: wrong results"
+        assert set(pylematch.matched_by_any('lint')) == {
+            path for path, is_matched in separate['lint'].items() if is_matched
+        }, "Test 2 failed: wrong paths for a single profile"
+
+    if 1:  # Test 3: Queries, lazy queries and per-profile verdicts agree with the masks.
+        pylematch = Pylematch(root=tmp_path, profiles=profiles)
+        lazy = Pylematch(root=tmp_path, profiles=profiles, lazy=True)
+
+        for path in ('dirA/file0.log', 'dirA/file1.log', 'dirB/', 'dirA/dirB/file1.txt', 'dirB/dirA/file1.log'):
+            assert lazy.is_matched(tmp_path / path) is (masks[path] != 0), f"Test 3 failed for '{path}': lazy"
+            assert pylematch.mask(tmp_path / path) == masks[path], f"Test 3 failed for '{path}': mask"
+            assert pylematch.verdicts(tmp_path / path) == {
+                name: separate[name][path] for name in pylematch.profiles
+            }, f"Test 3 failed for '{path}': verdicts"
+
+    if 1:  # Test 4: Profiles are checked.
+        with pytest.raises(ValueError):
+            Pylematch(root=tmp_path).masks()
+
+        with pytest.raises(ValueError):
+            Pylematch(root=tmp_path, profiles={'lint': ['*.log']}).matched_by_any('ship')
+
+        with pytest.raises(ValueError):
+            Pylematch(root=tmp_path, profiles={'.shipignore': ['*.log'], 'ship': '.shipignore'})
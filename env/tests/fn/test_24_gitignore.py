@@ -0,0 +1,66 @@
+"""
+gitignore-compatible syntax test.
+"""
+
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from env.common.mktree import mktree
+from pylematch.pylematch import Pylematch
+
+
+def files(root):
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            if '.git' not in os.path.relpath(dirpath, root).split(os.sep):
+                yield os.path.relpath(os.path.join(dirpath, filename), root)
+
+
+def test(tmp_path):
+    mktree(path=tmp_path, dir_number=3, file_number=3, depth=3)
+    (tmp_path / '.gitignore').write_text(
+        'file0.log\n/file1.txt\ndirB/\ndirA/dirC/*.txt\n**/dirA/**/file2.*\nfoo/*\n!foo/keep\na[!b]c\n'
+    )
+    for name in ('foo/keep', 'foo/drop', 'a/c', 'axc'):
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        (tmp_path / name).write_text('')
+    (tmp_path / 'dirA/.gitignore').write_text('*.log\n!file1.log\ndirA\n')
+    (tmp_path / 'dirC/.gitignore').write_text('dirB\n!dirB/file0.txt\n')
+
+    if 1:  # Test 1: The verdicts are those of git.
+        if shutil.which('git') is None:
+            pytest.skip('git is not available')
+
+        subprocess.run(['git', 'init', '-q', str(tmp_path)], check=True)
+        ignored = set(subprocess.run(
+            ['git', 'ls-files', '--others', '--ignored', '--exclude-standard'],
+            cwd=tmp_path, check=True, capture_output=True, text=True,
+        ).stdout.split())
+
+        for engine in ('regex', 'segment'):
+            pylematch = Pylematch(root=tmp_path, protocol='.gitignore', syntax='gitignore', engine=engine)
+            lazy = Pylematch(root=tmp_path, protocol='.gitignore', syntax='gitignore', lazy=True)
+
+            for path in files(tmp_path):
+                expected = path.replace(os.sep, '/') in ignored
+                assert pylematch.is_matched(tmp_path / path) is expected, f"Test 1 failed for '{path}' ({engine})"
+                assert lazy.is_matched(tmp_path / path) is expected, f"Test 1 failed for '{path}' (lazy)"
+
+    if 1:  # Test 2: The content of a matched directory is not listed.
+        pylematch = Pylematch(root=tmp_path, protocol='.gitignore', syntax='gitignore')
+        output = dict(pylematch.matched())
+
+        assert output['dirB/'] is True and output['dirA/dirB/'] is True, "Test 2 failed: wrong verdicts"
+        assert not any(path.startswith(('dirB/', 'dirA/dirB/')) and not path.endswith('B/') for path in output), \
+            "Test 2 failed: the content of a matched directory is listed"
+
+    if 1:  # Test 3: Subtree scans and per-protocol verdicts inherit from matched ancestors.
+        pylematch = Pylematch(root=tmp_path, protocol='.gitignore', syntax='gitignore')
+        output = pylematch.scan(tmp_path / 'dirB/dirA')
+
+        assert output and all(output.values()), "Test 3 failed: the content of 'dirB/' is not matched"
+        assert pylematch.verdicts(tmp_path / 'dirC/dirB/file0.txt') == {'.gitignore': True}, \
+            "Test 3 failed: a file in a matched directory is re-included"
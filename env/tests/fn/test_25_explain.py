@@ -0,0 +1,60 @@
+"""
+Explain and trace test.
+"""
+
+from env.common.mktree import mktree
+from pylematch.pylematch import Pylematch
+
+
+def test(tmp_path):
+    mktree(path=tmp_path, dir_number=2, file_number=2, depth=2)
+    (tmp_path / '.pylematch').write_text('# Logs\n**/*.log\n\ndirB/\n')
+    (tmp_path / 'dirA/.pylematch').write_text('!file0.log\n*.log\n!file1.*\n')
+
+    for trace in (False, True):
+        pylematch = Pylematch(root=tmp_path, trace=trace)
+        pylematch.matched()
+
+        if 1:  # Test 1: The deciding rule comes with its source file and line number.
+            explanation = pylematch.explain(tmp_path / 'dirA/file0.log')
+
+            assert explanation['path'] == 'dirA/file0.log', f"Test 1 failed: {explanation}"
+            assert explanation['matched'] is True, f"Test 1 failed: {explanation}"
+            assert explanation['rule'].pattern == '*.log', f"Test 1 failed: {explanation}"
+            assert (explanation['filepath'], explanation['line']) == (str(tmp_path / 'dirA/.pylematch'), 2), \
+                f"Test 1 failed: {explanation}"
+            assert [rule.pattern for rule in explanation['overridden']] == ['**/*.log', '!file0.log'], \
+                f"Test 1 failed: {explanation}"
+
+        if 1:  # Test 2: Negations and unmatched paths are explained.
+            explanation = pylematch.explain(tmp_path / 'dirA/file1.log')
+            assert explanation['matched'] is False and explanation['rule'].pattern == '!file1.*', \
+                f"Test 2 failed: {explanation}"
+            assert explanation['line'] == 3 and len(explanation['overridden']) == 2, f"Test 2 failed: {explanation}"
+
+            explanation = pylematch.explain(tmp_path / 'dirB/file0.txt')
+            assert explanation['matched'] is False and explanation['rule'] is None, f"Test 2 failed: {explanation}"
+            assert explanation['overridden'] == [], f"Test 2 failed: {explanation}"
+
+            assert pylematch.explain(tmp_path / 'dirB')['line'] == 4, "Test 2 failed: wrong line"
+
+        if 1:  # Test 3: The explanations agree with the verdicts.
+            for path, is_matched in pylematch.matched():
+                assert pylematch.explain(tmp_path / path)['matched'] is is_matched, f"Test 3 failed for '{path}'"
+
+    if 1:  # Test 4: Trace mode records a rule index per classified path.
+        pylematch = Pylematch(root=tmp_path, trace=True)
+        results = dict(pylematch.matched())
+
+        assert set(pylematch._decisions) == set(results), "Test 4 failed: wrong traced paths"
+        assert pylematch._decisions['dirA/file0.txt'] == -1, "Test 4 failed: wrong index"
+
+    if 1:  # Test 5: The lines survive compiled rules, and gitignore verdicts inherited from a directory are explained.
+        Pylematch(root=tmp_path).dump_rules(tmp_path / 'rules.json')
+        pylematch = Pylematch(root=tmp_path, compiled=tmp_path / 'rules.json')
+        assert pylematch.explain(tmp_path / 'dirA/file0.log')['line'] == 2, "Test 5 failed: the line is lost"
+
+        pylematch = Pylematch(root=tmp_path, syntax='gitignore')
+        explanation = pylematch.explain(tmp_path / 'dirB/dirA/file0.txt')
+        assert explanation['matched'] is True and explanation['inherited'] == 'dirB/', f"Test 5 failed: {explanation}"
+        assert explanation['rule'].pattern == 'dirB/', f"Test 5 failed: {explanation}"
@@ -0,0 +1,54 @@
+"""
+Subtree aggregates test.
+"""
+
+import os
+
+import pytest
+
+from env.common.mktree import mktree
+from pylematch.pylematch import Pylematch
+
+
+def test(tmp_path):
+    mktree(path=tmp_path, dir_number=3, file_number=2, depth=3)
+    (tmp_path / '.pylematch').write_text('**/*.log\ndirB/\n')
+    (tmp_path / 'dirA/.pylematch').write_text('!file0.log\n')
+
+    pylematch = Pylematch(root=tmp_path, aggregate=True)
+    results = dict(Pylematch(root=tmp_path).matched())
+
+    def expected(prefix, recursive=True):
+        paths = [
+            path for path in results if path.startswith(prefix) and path != prefix
+            and (recursive or os.sep not in path[len(prefix):].rstrip(os.sep))
+        ]
+        matched = [path for path in paths if results[path]]
+
+        return {
+            'matched': len(matched),
+            'ignored': len(paths) - len(matched),
+            'matched_bytes': sum(os.path.getsize(tmp_path / path) for path in matched if not path.endswith(os.sep)),
+        }
+
+    if 1:  # Test 1: The aggregates of subtrees are those computed from the results.
+        for prefix in ('', 'dirA/', 'dirB/', 'dirA/dirB/', 'dirC/dirA/dirB/'):
+            output = pylematch.summary(tmp_path / prefix)
+            assert output == expected(prefix), f"Test 1 failed for '{prefix}': {output}"
+
+    if 1:  # Test 2: The aggregates of the entries of a directory itself.
+        for prefix in ('', 'dirA/', 'dirC/dirB/'):
+            output = pylematch.summary(tmp_path / prefix, recursive=False)
+            assert output == expected(prefix, recursive=False), f"Test 2 failed for '{prefix}': {output}"
+
+    if 1:  # Test 3: Whether anything under a directory is matched.
+        (tmp_path / 'dirC/dirC/dirC/.pylematch').write_text('!*.log\n')
+        pylematch = Pylematch(root=tmp_path, aggregate=True)
+
+        assert pylematch.any_matched(tmp_path / 'dirA') is True, "Test 3 failed: wrong answer"
+        assert pylematch.any_matched(tmp_path / 'dirC/dirC/dirC') is False, "Test 3 failed: wrong answer"
+        assert pylematch.any_matched(tmp_path / 'missing') is None, "Test 3 failed: wrong answer"
+
+    if 1:  # Test 4: The aggregates must be requested.
+        with pytest.raises(ValueError):
+            Pylematch(root=tmp_path).summary(tmp_path)
@@ -0,0 +1,63 @@
+"""
+Memory-mapped snapshot test.
+"""
+
+import multiprocessing
+
+import pytest
+
+from env.common.mktree import mktree
+from pylematch.pylematch import Pylematch
+from pylematch.snapshot import Snapshot, write_snapshot
+
+
+def lookup(args):
+    path, queries = args
+    with Snapshot(path) as snapshot:
+        return [snapshot.is_matched(query) for query in queries]
+
+
+def test(tmp_path):
+    root = tmp_path / 'root'
+    mktree(path=root, dir_number=3, file_number=2, depth=3)
+    (root / '.pylematch').write_text('**/*.log\ndirB/\n')
+    (root / 'dirA/.pylematch').write_text('!file0.log\n*/*.txt\n')
+
+    pylematch = Pylematch(root=root)
+    results = dict(pylematch.matched())
+
+    if 1:  # Test 1: The snapshot holds exactly the results of the scan.
+        assert write_snapshot(pylematch, tmp_path / 'results.snap') == len(results), "Test 1 failed: wrong count"
+
+        with Snapshot(tmp_path / 'results.snap') as snapshot:
+            assert len(snapshot) == len(results), "Test 1 failed: wrong length"
+            assert dict(snapshot.items()) == results, "Test 1 failed: wrong results"
+
+            for path, is_matched in results.items():
+                assert snapshot.get(path) is is_matched, f"Test 1 failed for '{path}'"
+                assert snapshot.is_matched(root / path) is is_matched, f"Test 1 failed for '{path}'"
+
+            assert snapshot.get('missing') is None and 'missing' not in snapshot, "Test 1 failed: a missing path"
+
+    if 1:  # Test 2: Other processes query the same file.
+        queries = [str(root / path) for path in results]
+
+        with multiprocessing.get_context('spawn').Pool(2) as pool:
+            outputs = pool.map(lookup, [(str(tmp_path / 'results.snap'), queries)] * 2)
+
+        assert outputs == [list(results.values())] * 2, "Test 2 failed: wrong verdicts in a worker"
+
+    if 1:  # Test 3: Profile bitmasks and gitignore inheritance are kept.
+        pylematch = Pylematch(root=root, profiles={'logs': ['**/*.log'], 'b': ['**/dirB/']}, syntax='gitignore')
+        write_snapshot(pylematch, tmp_path / 'profiles.snap')
+
+        with Snapshot(tmp_path / 'profiles.snap') as snapshot:
+            assert dict(snapshot.items()) == dict(pylematch.masks()), "Test 3 failed: wrong masks"
+            assert snapshot.get('dirA/dirB/file0.log') == pylematch.mask(root / 'dirA/dirB/file0.log') == 3, \
+                "Test 3 failed: wrong inherited mask"
+
+    if 1:  # Test 4: Other files are rejected.
+        (tmp_path / 'other.snap').write_bytes(b'not a snapshot')
+
+        with pytest.raises(ValueError):
+            Snapshot(tmp_path / 'other.snap')
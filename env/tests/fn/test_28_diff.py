@@ -0,0 +1,127 @@
+"""
+Rule and snapshot diff test.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from env.common.mktree import mktree
+from pylematch.diff import diff_rules, diff_snapshots
+from pylematch.pylematch import Pylematch
+from pylematch.snapshot import Snapshot, write_snapshot
+
+
+def changes(old, new):
+    return {path: (old.get(path), new.get(path)) for path in set(old) | set(new) if old.get(path) != new.get(path)}
+
+
+def test(tmp_path):
+    root = tmp_path / 'tree'
+    root.mkdir()
+    mktree(path=root, dir_number=3, file_number=3, depth=3)
+    (root / '.pylematch').write_text('**/*.log\n')
+    (root / 'dirA/.pylematch').write_text('!file0.log\n')
+    revised = '!*.log\n**/*.txt\n'
+
+    before = dict(Pylematch(root=root).matched())
+    (root / 'dirA/.pylematch').write_text(revised)
+    after = dict(Pylematch(root=root).matched())
+    (root / 'dirA/.pylematch').write_text('!file0.log\n')
+
+    if 1:  # Test 1: The diff of the rules is that of two separate scans.
+        output = {path: (old, new) for path, old, new in diff_rules(
+            Pylematch(root=root), {root / 'dirA/.pylematch': revised}
+        )}
+
+        assert output and output == changes(before, after), "Test 1 failed: wrong changes"
+
+        for options in ({'same_filesystem': True}, {'follow_symlinks': True}):
+            pylematch = Pylematch(root=root, **options)
+            pylematch.matched()  # an earlier traversal leaves no state behind
+
+            output = {path: (old, new) for path, old, new in diff_rules(
+                pylematch, {root / 'dirA/.pylematch': revised}
+            )}
+            assert output == changes(before, after), f"Test 1 failed: wrong changes with {options}"
+
+    if 1:  # Test 2: Only the way down to the revised subtrees is listed.
+        pylematch = Pylematch(root=root)
+        listed = []
+        list_dir = pylematch._list_dir
+        pylematch._list_dir = lambda dirpath, *args: listed.append(dirpath) or list_dir(dirpath, *args)
+
+        list(diff_rules(pylematch, {root / 'dirA/dirB/.pylematch': '*.txt\n'}))
+
+        assert set(listed) == {str(root), str(root / 'dirA'), str(root / 'dirA/dirB')} | {
+            os.path.join(str(root / 'dirA/dirB'), name) for name in ('dirA', 'dirB', 'dirC')
+        }, "Test 2 failed: wrong listed directories"
+
+        with pytest.raises(ValueError):
+            list(diff_rules(pylematch, {root / 'dirA/rules.txt': '*.txt\n'}))
+
+    if 1:  # Test 3: In the `gitignore` syntax, the content of a newly matched directory is matched. The trace is kept.
+        (root / '.gitignore').write_text('*.log\n')
+        options = {'protocol': '.gitignore', 'syntax': 'gitignore'}
+        pylematch = Pylematch(root=root, trace=True, **options)
+        pylematch.matched()
+
+        output = {
+            path: (old, new) for path, old, new in diff_rules(pylematch, {root / '.gitignore': 'dirB/\n'})
+        }
+        (root / '.gitignore').write_text('dirB/\n')
+        revised_pylematch = Pylematch(root=root, **options)
+
+        assert output and all(revised_pylematch.is_matched(root / path) is new for path, (_, new) in output.items()), \
+            "Test 3 failed: wrong changes"
+        assert 'dirB/file0.log' not in output, "Test 3 failed: a file in a matched directory changed"
+
+        explanation = pylematch.explain(root / 'file0.log')
+        assert explanation['matched'] is True and explanation['rule'].pattern == '*.log', \
+            "Test 3 failed: the trace was overwritten"
+        (root / '.gitignore').unlink()
+
+    if 1:  # Test 4: The diff of two snapshots holds the changed, added and removed paths.
+        write_snapshot(Pylematch(root=root), tmp_path / 'before.snap')
+        (root / 'dirA/.pylematch').write_text(revised)
+        write_snapshot(Pylematch(root=root), tmp_path / 'after.snap')
+        (root / 'dirA/.pylematch').write_text('!file0.log\n')
+
+        with Snapshot(tmp_path / 'before.snap') as old, Snapshot(tmp_path / 'after.snap') as new:
+            output = {path: (old, new) for path, old, new in diff_snapshots(old, new, block=8)}
+            assert output == changes(before, after), "Test 4 failed: wrong changes"
+            assert not list(diff_snapshots(old, old)), "Test 4 failed: identical snapshots differ"
+
+        os.rename(root / 'dirB', root / 'dirD')
+        write_snapshot(Pylematch(root=root), tmp_path / 'moved.snap')
+        moved = dict(Pylematch(root=root).matched())
+
+        with Snapshot(tmp_path / 'before.snap') as old, Snapshot(tmp_path / 'moved.snap') as new:
+            output = {path: (old, new) for path, old, new in diff_snapshots(old, new, block=8)}
+            assert output == changes(before, moved), "Test 4 failed: wrong added or removed paths"
+
+        os.rename(root / 'dirD', root / 'dirB')
+
+    if 1:  # Test 5: The command line prints the changes and fails if there are any.
+        (tmp_path / 'revised').write_text(revised)
+        command = [sys.executable, '-m', 'pylematch']
+        environment = {**os.environ, 'PYTHONPATH': os.getcwd()}
+
+        result = subprocess.run(
+            command + ['diff-rules', str(root), '--replace', str(root / 'dirA/.pylematch'), 'revised'],
+            cwd=tmp_path, env=environment, capture_output=True, text=True,
+        )
+        expected = changes(before, after)
+
+        assert result.returncode == 1, f"Test 5 failed: {result.stderr}"
+        assert sorted(result.stdout.splitlines()) == sorted(
+            f"{'+' if new else '-'} {path}" for path, (_, new) in expected.items()
+        ), "Test 5 failed: wrong output"
+
+        result = subprocess.run(
+            command + ['diff-snapshots', 'before.snap', 'before.snap'], cwd=tmp_path, env=environment,
+            capture_output=True, text=True,
+        )
+        assert result.returncode == 0 and not result.stdout, f"Test 5 failed: {result.stderr}"
@@ -0,0 +1,53 @@
+"""
+Protocol file loading test.
+"""
+
+import os
+
+from env.common.mktree import mktree
+from pylematch import pylematch as module
+from pylematch.pylematch import Pylematch
+
+
+def test(tmp_path):
+    mktree(path=tmp_path, dir_number=2, file_number=2, depth=2)
+
+    if 1:  # Test 1: The encoding is explicit, a byte order mark is ignored and line numbers are kept.
+        (tmp_path / '.pylematch').write_bytes('\ufeff*.log\r\n# Comment\r\n\r\ndirB/\r\n'.encode('utf-8'))
+        pylematch = Pylematch(root=tmp_path)
+
+        rules = [(rule.pattern, rule.line) for rule in pylematch.get_rules(str(tmp_path))]
+        assert rules == [('*.log', 1), ('dirB/', 4)], "Test 1 failed: wrong rules"
+
+        (tmp_path / 'dirA/.pylematch').write_bytes('fil[eé]0.txt\n'.encode('latin-1'))
+        pylematch = Pylematch(root=tmp_path, encoding='latin-1')
+
+        assert pylematch.is_matched(tmp_path / 'dirA/file0.txt'), "Test 1 failed: wrong encoding"
+        (tmp_path / 'dirA/.pylematch').unlink()
+
+    if 1:  # Test 2: Files over the size or line limits are not loaded.
+        (tmp_path / '.pylematch').write_text('*.log\ndirB/\n')
+
+        assert Pylematch(root=tmp_path, max_file_size=12, max_lines=2).is_matched(tmp_path / 'dirB'), \
+            "Test 2 failed: a file within the limits is not loaded"
+        assert not Pylematch(root=tmp_path, max_file_size=11).is_matched(tmp_path / 'dirB'), \
+            "Test 2 failed: a file over the size limit is loaded"
+        assert not Pylematch(root=tmp_path, max_lines=1).is_matched(tmp_path / 'dirB'), \
+            "Test 2 failed: a file over the line limit is loaded"
+
+    if 1:  # Test 3: Parsed files are shared by instances until they change.
+        filepath = tmp_path / '.pylematch'
+        filepath.write_text('*.log\n')
+        Pylematch(root=tmp_path).get_rules(str(tmp_path))
+
+        stat = os.stat(filepath)
+        key = (str(filepath), stat.st_mtime_ns, stat.st_size, 'utf-8')
+        assert module._parsed[key] == (1, [(1, '*.log')]), "Test 3 failed: the file is not cached"
+
+        module._parsed[key] = (1, [(1, '*.txt')])
+        assert Pylematch(root=tmp_path).is_matched(tmp_path / 'file0.txt'), "Test 3 failed: the file is parsed again"
+
+        filepath.write_text('*.md\n')
+        os.utime(filepath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        assert [rule.pattern for rule in Pylematch(root=tmp_path).get_rules(str(tmp_path))] == ['*.md'], \
+            "Test 3 failed: a changed file is not parsed again"
@@ -0,0 +1,85 @@
+"""
+Error reporting test.
+"""
+
+import logging
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+from env.common.mktree import mktree
+from pylematch.pylematch import Pylematch
+
+
+def test(tmp_path, capsys, caplog):
+    mktree(path=tmp_path, dir_number=3, file_number=2, depth=2)
+    (tmp_path / '.pylematch').write_text('*.log\n')
+
+    for name in ('dirA', 'dirB', 'dirC'):
+        (tmp_path / name / '.pylematch').write_bytes(b'\xff*.txt\n')  # not UTF-8
+
+    if 1:  # Test 1: Unreadable protocol files are collected without output, and do not stop the scan.
+        pylematch = Pylematch(root=tmp_path, log_rate=None)
+        output = dict(pylematch.matched())
+
+        assert output['file0.log'] is True and output['dirA/file0.txt'] is False, "Test 1 failed: wrong results"
+        assert not capsys.readouterr().out, "Test 1 failed: errors are printed"
+        assert sorted((error['path'], error['operation']) for error in pylematch.errors) == [
+            (str(tmp_path / name / '.pylematch'), 'read') for name in ('dirA', 'dirB', 'dirC')
+        ], "Test 1 failed: wrong errors"
+        assert all(isinstance(error['error'], UnicodeDecodeError) for error in pylematch.errors), \
+            "Test 1 failed: wrong exceptions"
+
+    if 1:  # Test 2: The errors kept are bounded, all are counted.
+        pylematch = Pylematch(root=tmp_path, max_errors=2, log_rate=None)
+        pylematch.matched()
+
+        assert len(pylematch.errors) == 2 and pylematch.error_count == 3, "Test 2 failed: wrong errors"
+
+    if 1:  # Test 3: The walk passes directories which cannot be listed to `onerror`, which may abort it.
+        def prune(relpath, is_matched):
+            if relpath == 'dirB/':
+                shutil.rmtree(tmp_path / 'dirB')  # removed after being listed by its parent
+
+            return False
+
+        errors = []
+        pylematch = Pylematch(root=tmp_path, log_rate=None)
+        output = dict(pylematch.walk(prune=prune, onerror=errors.append))
+
+        assert 'dirC/file0.txt' in output, "Test 3 failed: the walk stopped"
+        assert sorted(type(error).__name__ for error in errors) == [
+            'FileNotFoundError', 'UnicodeDecodeError', 'UnicodeDecodeError'
+        ], f"Test 3 failed: {errors}"
+        assert [error['path'] for error in pylematch.errors if error['operation'] == 'list'] == [
+            str(tmp_path / 'dirB')
+        ], "Test 3 failed: wrong errors"
+
+        def onerror(error):
+            raise error
+
+        with pytest.raises(UnicodeDecodeError):
+            list(Pylematch(root=tmp_path, log_rate=None).walk(onerror=onerror))
+
+    if 1:  # Test 4: Logging is rate limited.
+        for index in range(20):
+            (tmp_path / 'many' / str(index)).mkdir(parents=True)
+            (tmp_path / 'many' / str(index) / '.pylematch').write_bytes(b'\xff')
+
+        with caplog.at_level(logging.WARNING, logger='pylematch'):
+            Pylematch(root=tmp_path, log_rate=1).matched()
+
+        records = [record for record in caplog.records if record.name == 'pylematch']
+        assert 1 <= len(records) <= 3, f"Test 4 failed: {len(records)} errors logged"
+
+    if 1:  # Test 5: Nothing is written to the standard streams unless logging is configured.
+        code = f"from pylematch.pylematch import Pylematch; Pylematch(root={str(tmp_path)!r}).matched()"
+        result = subprocess.run(
+            [sys.executable, '-c', code], env={**os.environ, 'PYTHONPATH': os.getcwd()}, capture_output=True,
+            text=True,
+        )
+
+        assert result.returncode == 0 and not result.stdout and not result.stderr, f"Test 5 failed: {result.stderr}"
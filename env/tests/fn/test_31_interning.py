@@ -0,0 +1,46 @@
+"""
+Rule interning test.
+"""
+
+from env.common.mktree import mktree
+from pylematch.pylematch import Pylematch
+
+
+def test(tmp_path):
+    mktree(path=tmp_path, dir_number=3, file_number=2, depth=2)
+    for name in ('dirA', 'dirB', 'dirC'):
+        (tmp_path / name / '.pylematch').write_text('*.log\n**/file0.*\n!dirA/\n')
+
+    for engine in ('regex', 'segment'):
+        pylematch = Pylematch(root=tmp_path, engine=engine)
+        output = dict(pylematch.matched())
+        rules = {name: pylematch.get_rules(str(tmp_path / name)) for name in ('dirA', 'dirB', 'dirC')}
+
+        if engine == 'regex':  # Test 1: The rules of identical protocol files share their compiled regexes.
+            for index in range(3):
+                assert rules['dirA'][index]._compiled is rules['dirC'][index]._compiled, \
+                    f"Test 1 failed: the rule {index} is compiled twice ({engine})"
+                assert rules['dirA'][index]._local[0] != rules['dirC'][index]._local[0], \
+                    f"Test 1 failed: the rule {index} ignores its context ({engine})"
+
+        if 1:  # Test 2: The rules keep their context.
+            assert rules['dirB'][0].regex.startswith('^dirB/'), f"Test 2 failed: {rules['dirB'][0].regex}"
+            assert rules['dirB'][2].context == 'dirB/', f"Test 2 failed: {rules['dirB'][2].context}"
+
+        if 1:  # Test 3: The verdicts depend on the context.
+            expected = {
+                'dirA/file0.log': True, 'dirA/file1.log': True, 'file0.log': False, 'dirB/dirA/': False,
+                'dirB/dirC/file0.txt': True, 'dirC/file1.txt': False, 'dirC/dirA/': False, 'dirC/dirA/file0.log': True,
+            }
+
+            for path, is_matched in expected.items():
+                assert output[path] is is_matched, f"Test 3 failed for '{path}' ({engine})"
+
+    if 1:  # Test 4: Directory names with characters escaped in regexes keep their context.
+        for name in ('a\nb', 'a.b (c)'):
+            (tmp_path / name).mkdir()
+            (tmp_path / name / '.pylematch').write_text('*.log\n')
+            (tmp_path / name / 'x.log').write_text('')
+
+            assert Pylematch(root=tmp_path).is_matched(tmp_path / name / 'x.log') is True, \
+                f"Test 4 failed for {name!r}"
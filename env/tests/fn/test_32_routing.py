@@ -0,0 +1,56 @@
+"""
+Context routing test.
+"""
+
+import os
+
+from env.common.mktree import mktree
+from pylematch.pylematch import Pylematch
+
+
+def test(tmp_path):
+    mktree(path=tmp_path, dir_number=2, file_number=2, depth=4)
+
+    directory = tmp_path
+    for name in ('', 'dirA', 'dirB', 'dirA', 'dirB'):
+        directory = directory / name
+        (directory / '.pylematch').write_text('*.log\n!file0.*\n**/dirA/\n')
+
+    deepest = str(tmp_path / 'dirA/dirB/dirA/dirB')
+
+    if 1:  # Test 1: The rules of a directory are grouped by context, from the root down.
+        pylematch = Pylematch(root=tmp_path)
+        rules = pylematch.get_rules(deepest)
+        route = pylematch._route(rules)
+
+        assert [prefix for prefix, _ in route] == [
+            '', 'dirA/', 'dirA/dirB/', 'dirA/dirB/dirA/', 'dirA/dirB/dirA/dirB/'
+        ], "Test 1 failed: wrong groups"
+        assert [rule for _, group in route for _, _, _, rule in group] == rules, "Test 1 failed: wrong order"
+
+    if 1:  # Test 2: The verdicts are those of the rules matched one by one.
+        for dirpath, _, filenames in os.walk(tmp_path):
+            rules = pylematch.get_rules(dirpath)
+            prefix = os.path.relpath(dirpath, tmp_path) + os.sep if dirpath != str(tmp_path) else ''
+
+            for filename in filenames:
+                expected = False
+                for rule in rules:
+                    if rule.match(prefix + filename):
+                        expected = not rule.is_negation
+
+                assert pylematch._evaluate(rules, prefix + filename) is expected, f"Test 2 failed for '{filename}'"
+
+    if 1:  # Test 3: Added rules are routed, and only added to their directory.
+        inheriting = str(tmp_path / 'dirB')  # without a protocol file, like its sibling in `dirA/dirB/`
+        shared = len(pylematch.get_rules(inheriting))
+
+        pylematch.add_rule(deepest, 'file0.txt')
+        pylematch.add_rule(inheriting, 'file1.txt')
+        rules = pylematch.get_rules(deepest)
+
+        assert sum(len(group) for _, group in pylematch._route(rules)) == len(rules), "Test 3 failed: stale groups"
+        assert len(pylematch.get_rules(inheriting)) == shared + 1, "Test 3 failed: wrong rules"
+        assert len(pylematch.get_rules(str(tmp_path))) == shared and \
+            len(pylematch.get_rules(str(tmp_path / 'dirA/dirB/dirB'))) == 3 * shared, \
+            "Test 3 failed: a rule was added to other directories"
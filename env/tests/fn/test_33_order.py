@@ -0,0 +1,48 @@
+"""
+Traversal order test.
+"""
+
+import os
+
+from env.common.mktree import mktree
+from pylematch.pylematch import Pylematch
+
+
+def find(root, prefix=''):
+    for name in sorted(os.listdir(os.path.join(root, prefix))):
+        if os.path.isdir(os.path.join(root, prefix, name)):
+            yield prefix + name + os.sep
+            yield from find(root, prefix + name + os.sep)
+        else:
+            yield prefix + name
+
+
+def test(tmp_path):
+    mktree(path=tmp_path, dir_number=3, file_number=3, depth=3)
+    for name in ('b.txt', 'dirA0', 'a', 'dirB/Z.log', 'dirB/_'):
+        (tmp_path / name).write_text('')
+    (tmp_path / '.pylematch').write_text('*.log\ndirC/\n')
+
+    expected = list(find(tmp_path))
+
+    if 1:  # Test 1: Every directory is followed by its content, the entries of a directory are sorted by name.
+        pylematch = Pylematch(root=tmp_path)
+
+        assert [path for path, _ in pylematch.walk()] == expected, "Test 1 failed: wrong walk order"
+        assert [path for path, _ in pylematch.walk(per_protocol=True)] == expected, \
+            "Test 1 failed: wrong per-protocol walk order"
+        assert [path for path, _ in pylematch.matched()] == expected, "Test 1 failed: wrong scan order"
+
+    if 1:  # Test 2: Subtrees and pruned walks keep the order.
+        assert list(Pylematch(root=tmp_path).scan(tmp_path / 'dirB')) == [
+            path for path in expected if path.startswith('dirB' + os.sep)
+        ], "Test 2 failed: wrong subtree order"
+
+        output = [path for path, _ in Pylematch(root=tmp_path).walk(prune=lambda path, is_matched: is_matched)]
+        pruned = [path for path in expected if path.startswith('dirC' + os.sep) and path != 'dirC' + os.sep]
+
+        assert output == [path for path in expected if path not in pruned], "Test 2 failed: wrong pruned walk order"
+
+        pylematch = Pylematch(root=tmp_path)
+        pylematch.scan(tmp_path / 'dirB')
+        assert [path for path, _ in pylematch.matched()] == expected, "Test 2 failed: wrong order after a subtree scan"
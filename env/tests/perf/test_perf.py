@@ -0,0 +1,119 @@
+"""
+Performance regression test.
+
+Runs the pattern scenarios of the functional tests on a large generated tree and compares the scan time and peak
+memory with `baseline.json`. Times are divided by the time of a calibration walk over the same tree, timed again
+before every scenario, which makes them comparable between machines and loads. The test fails if a scenario exceeds
+its baseline by more than the budget factor, which leaves room for noise but not for a change in complexity.
+
+Usage:
+    python -m pytest -q env/tests/perf
+    PYLEMATCH_PERF_UPDATE=1 python -m pytest -q env/tests/perf  # record a new baseline
+"""
+
+import gc
+import json
+import os
+import re
+import time
+import tracemalloc
+
+from env.common.mktree import mktree
+from pylematch import pylematch as module
+from pylematch.pylematch import Pylematch
+
+BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+RUNS = 5
+
+# The protocol files of every scenario, by path relative to the root
+SCENARIOS = {
+    'single_asterisk': {'.pylematch': '*\n!*/\ndirA/*/\n', 'dirB/.pylematch': '*.log\n'},
+    'double_asterisk': {'.pylematch': '**/*.log\ndirA/**\n**/dirB/**/file0.*\n!**/dirC/**/'},
+    'brackets': {'.pylematch': 'file[0-2].*\n**/dir[!A]/\n**/file[!0-9].txt\n', 'dirC/.pylematch': '[fd]*[0-9].log\n'},
+    'negation': {'.pylematch': '**\n!*.txt\n!**/dirB/\n', 'dirA/.pylematch': '!*.log\nfile0.*\n'},
+    'escaped': {'.pylematch': '\\#*.txt\n**/file\\*.log\n**/\\[dirA\\]/\n!\\!file0.log\n'},
+    'deep': {'.pylematch': '**/dirA/**/dirB/**/dirC/**/file0.*\n**/dirB/**/dirA/**/dirB/\n'},
+    'many_rules': {'.pylematch': '\n'.join(f'**/dir{letter}/file{digit}.log\n!**/dirA/**/file{digit}.txt'
+                                          for letter in 'ABC' for digit in range(10))},
+}
+
+
+def calibrate(root):
+    """Walk the tree and match every path against a regex, the same work as a scan without the rules."""
+    regex = re.compile(r'^(?:.*/)?file[0-9]\.log$')
+    stack = [(root, '')]
+
+    while stack:
+        dirpath, prefix = stack.pop()
+        with os.scandir(dirpath) as it:
+            for entry in sorted(it, key=lambda entry: entry.name):
+                regex.match(prefix + entry.name)
+                if entry.is_dir():
+                    stack.append((entry.path, prefix + entry.name + '/'))
+
+
+def best(function, runs=RUNS):
+    timings = []
+
+    for _ in range(runs):
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def scan(root):
+    # Start from cold caches, as a new process would
+    module._parsed.clear()
+    module._interned.clear()
+
+    return dict(Pylematch(root=root).matched())
+
+
+def test(tmp_path, record_property):
+    mktree(path=tmp_path, dir_number=5, file_number=5, depth=4)
+
+    with open(BASELINE, 'r', encoding='utf-8') as file:
+        baseline = json.load(file)
+
+    results, failures = {}, []
+
+    for name, protocols in SCENARIOS.items():
+        for relpath, content in protocols.items():
+            (tmp_path / relpath).write_text(content)
+
+        calibration = best(lambda: calibrate(str(tmp_path)))
+        seconds = best(lambda: scan(tmp_path))
+
+        tracemalloc.start()
+        scan(tmp_path)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        results[name] = {'time': round(seconds / calibration, 2), 'memory': peak}
+        record_property(name, f"{seconds * 1000:.0f} ms, {results[name]['time']}x calibration, {peak >> 10} KiB")
+
+        expected = baseline['scenarios'].get(name)
+        if expected is not None:
+            for metric in ('time', 'memory'):
+                if results[name][metric] > expected[metric] * baseline['budget'][metric]:
+                    failures.append(
+                        f"{name}: {metric} {results[name][metric]} over {baseline['budget'][metric]}x "
+                        f"the baseline of {expected[metric]}"
+                    )
+
+        for relpath in protocols:
+            (tmp_path / relpath).unlink()
+
+    if os.environ.get('PYLEMATCH_PERF_UPDATE'):
+        baseline['scenarios'] = results
+
+        with open(BASELINE, 'w', encoding='utf-8') as file:
+            json.dump(baseline, file, indent=4)
+            file.write('\n')
+
+        return
+
+    assert not failures, "Performance budget exceeded:\n" + '\n'.join(failures)
@@ -18,8 +18,8 @@ def clean_pycache(directory):
             shutil.rmtree(pycache_path)
 
 
-def run_tests():
-    """Run all tests in the `tests` directory."""
+def run_tests(perf=False):
+    """Run all tests in the `tests` directory, and the performance tests if `perf` is set."""
 
     environment = 'env'
     test_modules = []  # List to keep track of test modules
@@ -27,7 +27,11 @@ def run_tests():
     # Clean up `__pycache__` before running tests
     clean_pycache(environment)
 
-    for test_file in sorted(glob.glob(os.path.join(environment, 'tests/fn', 'test_*.py'))):
+    test_files = sorted(glob.glob(os.path.join(environment, 'tests/fn', 'test_*.py')))
+    if perf:
+        test_files += sorted(glob.glob(os.path.join(environment, 'tests/perf', 'test_*.py')))
+
+    for test_file in test_files:
         if os.path.exists(test_file):
             spec = importlib.util.spec_from_file_location("test", test_file)
             test_module = importlib.util.module_from_spec(spec)
@@ -44,4 +48,4 @@ def run_tests():
 
 
 if __name__ == '__main__':
-    run_tests()
+    run_tests(perf='--perf' in sys.argv[1:])
@@ -2,3 +2,13 @@
 Pylematch: A module for matching file system paths against patterns.
 """
 __version__ = "0.0.1"
+
+
+def __getattr__(name):
+    # Import the implementation on first attribute access, so a bare `import pylematch` costs next to nothing.
+    if name == 'Pylematch':
+        from .pylematch import Pylematch
+
+        return Pylematch
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
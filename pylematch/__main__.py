@@ -0,0 +1,88 @@
+"""
+Module:        Pylematch
+Description:   Command line interface.
+Author:        Andrii Burkatskyi aka andr11b
+Year:          2024
+Version:       0.0.1
+License:       MIT License
+Email:         4ndr116@gmail.com, andr11b@ukr.net
+Link:          https://github.com/codyverse/pylematch
+"""
+
+import argparse
+import sys
+
+
+def _format(relpath, old, new):
+    if isinstance(old, int) and not isinstance(old, bool) or isinstance(new, int) and not isinstance(new, bool):
+        return f"~ {relpath} ({old} -> {new})"
+
+    return f"{'+' if new else '-'} {relpath}"
+
+
+def _diff_rules(args):
+    from pylematch.diff import diff_rules
+    from pylematch.pylematch import Pylematch
+
+    pylematch = Pylematch(root=args.root, protocol=args.protocol or '.pylematch', syntax=args.syntax)
+    overrides = {}
+
+    for filepath, revised in args.replace:
+        with open(revised, 'r') as file:
+            overrides[filepath] = file.read()
+
+    for filepath in args.delete:
+        overrides[filepath] = None
+
+    return diff_rules(pylematch, overrides)
+
+
+def _diff_snapshots(args):
+    from pylematch.diff import diff_snapshots
+    from pylematch.snapshot import Snapshot
+
+    with Snapshot(args.old) as old, Snapshot(args.new) as new:
+        yield from diff_snapshots(old, new)
+
+
+def main(argv=None):
+    """
+    Run the command line interface.
+
+    Prints one line per changed path: `+ path` if it becomes matched, `- path` if it no longer is, and
+    `~ path (old -> new)` for the bitmasks of profiles.
+
+    Returns:
+        int: 0 if no verdict changes, 1 otherwise, like `diff`.
+    """
+    parser = argparse.ArgumentParser(prog='python -m pylematch', description='Pylematch utilities.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    rules = commands.add_parser('diff-rules', help='compare the verdicts of revised protocol files in one walk')
+    rules.add_argument('root', help='the root directory of the tree')
+    rules.add_argument(
+        '--replace', nargs=2, action='append', default=[], metavar=('FILE', 'REVISED'),
+        help='a protocol file of the tree and the file holding its revised content',
+    )
+    rules.add_argument('--delete', action='append', default=[], metavar='FILE', help='a deleted protocol file')
+    rules.add_argument('--protocol', action='append', help='a protocol file name (repeat for several)')
+    rules.add_argument('--syntax', default='pylematch', choices=('pylematch', 'gitignore'))
+    rules.set_defaults(run=_diff_rules)
+
+    snapshots = commands.add_parser('diff-snapshots', help='compare two snapshots')
+    snapshots.add_argument('old', help='the earlier snapshot file')
+    snapshots.add_argument('new', help='the later snapshot file')
+    snapshots.set_defaults(run=_diff_snapshots)
+
+    args = parser.parse_args(argv)
+    changed = False
+
+    for relpath, old, new in args.run(args):
+        print(_format(relpath, old, new))
+        changed = True
+
+    return 1 if changed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
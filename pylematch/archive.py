@@ -0,0 +1,202 @@
+"""
+Module:        Pylematch
+Description:   Streaming archive builder driven by match results.
+Author:        Andrii Burkatskyi aka andr11b
+Year:          2024
+Version:       0.0.1
+License:       MIT License
+Email:         4ndr116@gmail.com, andr11b@ukr.net
+Link:          https://github.com/codyverse/pylematch
+"""
+
+import os
+import shutil
+import stat
+import tarfile
+import zipfile
+from collections import deque
+
+FORMATS = {
+    'tar': ('.tar', ),
+    'gztar': ('.tar.gz', '.tgz'),
+    'zip': ('.zip', ),
+}
+
+
+class _ParallelGzipWriter:
+    """
+    A write-only file object compressing its input to gzip with several worker threads.
+
+    The input is split into fixed-size chunks which are compressed independently and written out in order, each as a
+    separate gzip member. A multi-member stream is a valid gzip file, and zlib releases the GIL while compressing, so
+    the chunks are really compressed in parallel. The number of chunks in flight is bounded to keep memory bounded.
+    """
+
+    def __init__(self, fileobj, workers, level=6, chunk_size=1 << 20):
+        from concurrent.futures import ThreadPoolExecutor
+
+        self._fileobj = fileobj
+        self._level = level
+        self._chunk_size = chunk_size
+        self._buffer = bytearray()
+        self._pending = deque()
+        self._max_pending = workers * 2
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+
+    def _compress(self, data):
+        import zlib
+
+        compressor = zlib.compressobj(self._level, zlib.DEFLATED, 31)  # 31: gzip header and trailer
+
+        return compressor.compress(data) + compressor.flush()
+
+    def _submit(self, data):
+        self._pending.append(self._executor.submit(self._compress, data))
+
+        while len(self._pending) > self._max_pending:
+            self._fileobj.write(self._pending.popleft().result())
+
+    def write(self, data):
+        self._buffer += data
+
+        while len(self._buffer) >= self._chunk_size:
+            self._submit(bytes(self._buffer[:self._chunk_size]))
+            del self._buffer[:self._chunk_size]
+
+        return len(data)
+
+    def close(self):
+        try:
+            if self._buffer:
+                self._submit(bytes(self._buffer))
+                self._buffer.clear()
+
+            while self._pending:
+                self._fileobj.write(self._pending.popleft().result())
+        finally:
+            self._executor.shutdown()
+
+
+def _guess_format(dest):
+    for format, extensions in FORMATS.items():
+        if str(dest).endswith(extensions):
+            return format
+
+    raise ValueError(f"Cannot guess the archive format of '{dest}', use one of: {', '.join(FORMATS)}.")
+
+
+def archive(pylematch, dest, format=None, exclude=True, prefix='', workers=1, level=6, bufsize=1 << 20):
+    """
+    Write the files selected by match results into a tar, tar.gz or zip archive.
+
+    The archive is written while the tree is traversed, without collecting the results first, so memory stays
+    bounded regardless of the number of files.
+
+    Args:
+        pylematch (Pylematch): The instance providing the verdicts.
+        dest (str): The path of the archive to create.
+        format (str): One of `tar`, `gztar` or `zip`. If omitted, it is guessed from the extension of `dest`.
+        exclude (bool): If True (default), matched paths are left out of the archive and the content of matched
+                        directories is skipped without being listed, i.e., the rules work like `.gitignore`.
+                        If False, only matched paths are written to the archive.
+        prefix (str): An optional directory name to put the archived paths under.
+        workers (int): The number of compression threads for `gztar`. Other formats are written by a single thread.
+        level (int): The compression level, from 0 to 9.
+        bufsize (int): The size of the buffer used to copy file contents.
+
+    Returns:
+        int: The number of files and directories written to the archive. FIFOs, sockets and devices are left out.
+
+    Example:
+        # Build a release archive, leaving out everything matched by the `.pylematch` files
+        archive(Pylematch(root='path_to_your_project'), 'release.tar.gz', workers=4)
+    """
+    format = format or _guess_format(dest)
+    if format not in FORMATS:
+        raise ValueError(f"Unsupported archive format '{format}', use one of: {', '.join(FORMATS)}.")
+
+    dest = os.path.abspath(dest)
+    prune = (lambda relpath, is_matched: is_matched) if exclude else None
+    selected = (
+        (
+            entry,
+            os.path.join(prefix, relpath).replace(os.sep, '/').rstrip('/'),
+            # A symbolic link to a directory is walked into, and so stored as a directory, with `follow_symlinks`
+            relpath.endswith(os.sep) and (pylematch._follow_symlinks or not entry.is_symlink()),
+        )
+        for relpath, entry, is_matched in pylematch._walk(prune)
+        if is_matched != exclude and entry.path != dest  # never archive the archive itself
+    )
+
+    if format == 'zip':
+        return _write_zip(dest, selected, level, bufsize)
+
+    return _write_tar(dest, selected, format == 'gztar', workers, level, bufsize)
+
+
+def _write_tar(dest, selected, compress, workers, level, bufsize):
+    import gzip
+
+    count = 0
+
+    with open(dest, 'wb') as raw:
+        if compress and workers > 1:
+            stream = _ParallelGzipWriter(raw, workers, level, bufsize)
+        elif compress:
+            # The stream mode of `tarfile` takes no compression level, so the stream is compressed outside of it
+            stream = gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=level)
+        else:
+            stream = raw
+
+        try:
+            with tarfile.open(fileobj=stream, mode='w|', bufsize=bufsize, copybufsize=bufsize) as tar:
+                for entry, arcname, is_dir in selected:
+                    st = entry.stat(follow_symlinks=False)
+
+                    if is_dir and stat.S_ISLNK(st.st_mode):
+                        tarinfo = tarfile.TarInfo(arcname)
+                        tarinfo.type = tarfile.DIRTYPE
+                        st = os.stat(entry.path)
+                        tarinfo.mode, tarinfo.mtime = stat.S_IMODE(st.st_mode), st.st_mtime
+                        tarinfo.uid, tarinfo.gid = st.st_uid, st.st_gid
+                    elif is_dir or stat.S_ISREG(st.st_mode) or stat.S_ISLNK(st.st_mode):
+                        tarinfo = tar.gettarinfo(entry.path, arcname)
+                    else:
+                        continue  # FIFOs, sockets and devices are left out, reading a FIFO would block
+
+                    if tarinfo.isreg():
+                        with open(entry.path, 'rb') as file:
+                            tar.addfile(tarinfo, file)
+                    else:
+                        tar.addfile(tarinfo)
+
+                    count += 1
+        finally:
+            if stream is not raw:
+                stream.close()
+
+    return count
+
+
+def _write_zip(dest, selected, level, bufsize):
+    count = 0
+
+    with zipfile.ZipFile(dest, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=level) as zf:
+        for entry, arcname, is_dir in selected:
+            # Zip archives have no links, links are stored as their targets
+            mode = entry.stat().st_mode
+            if not (is_dir or stat.S_ISREG(mode) or stat.S_ISDIR(mode)):
+                continue  # FIFOs, sockets and devices are left out, reading a FIFO would block
+
+            zinfo = zipfile.ZipInfo.from_file(entry.path, arcname)
+
+            if zinfo.is_dir():
+                zf.writestr(zinfo, b'')
+            else:
+                zinfo.compress_type = zipfile.ZIP_DEFLATED
+                with open(entry.path, 'rb') as src, zf.open(zinfo, 'w') as dst:
+                    shutil.copyfileobj(src, dst, bufsize)
+
+            count += 1
+
+    return count
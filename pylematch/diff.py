@@ -0,0 +1,197 @@
+"""
+Module:        Pylematch
+Description:   Changed verdicts between rule revisions or stored snapshots.
+Author:        Andrii Burkatskyi aka andr11b
+Year:          2024
+Version:       0.0.1
+License:       MIT License
+Email:         4ndr116@gmail.com, andr11b@ukr.net
+Link:          https://github.com/codyverse/pylematch
+"""
+
+import os
+
+from pylematch.snapshot import _OFFSET
+
+
+def _revise_rules(pylematch, dirpath, old_parent, old_rules, new_parent, overrides):
+    """
+    Build the revised rules of a directory: the revised parent rules, followed by the local rules with the
+    overridden protocol files replaced, in the order of the protocol names.
+    """
+    local = old_rules[len(old_parent):]
+    rules = list(new_parent)
+
+    for protocol in pylematch._protocols:
+        filepath = os.path.join(dirpath, protocol)
+
+        if filepath in overrides:
+            if overrides[filepath] is not None:
+                revised = pylematch._parse_lines(dirpath, filepath, enumerate(overrides[filepath].splitlines(), 1))
+                rules.extend(pylematch._check_complexity(revised, filepath))
+        else:
+            rules.extend(rule for rule in local if rule.protocol == protocol)
+
+    return rules
+
+
+def diff_rules(pylematch, overrides):
+    """
+    Compare the verdicts of the current rules with those of revised protocol files, in a single traversal.
+
+    Both rule sets are evaluated side by side while the tree is read once. Only the directories along the paths to
+    the revised protocol files and the subtrees below them are listed: everywhere else the rules are the same, and
+    so are the verdicts.
+
+    Args:
+        pylematch (Pylematch): The instance providing the tree and the current rules.
+        overrides (dict): A mapping of protocol file paths to their revised content, or None for a deleted file.
+                          The files do not have to exist, so new protocol files can be compared too.
+
+    Yields:
+        tuple: A `(relpath, old, new)` tuple for each path whose verdict changes, in the format of `matched` (the
+               bitmasks of the verdicts with profiles).
+
+    Raises:
+        ValueError: If a path is not a protocol file inside the root directory.
+
+    Note:
+        In the `gitignore` syntax, the content of a directory matched by the current rules is not listed, so if the
+        revision unmatches it, only the directory is reported, and not its content. The content of a directory the
+        revision matches is reported as matched.
+
+    Example:
+        for path, old, new in diff_rules(pylematch, {'path_to_your_project/.pylematch': revised_content}):
+            print('+' if new else '-', path)
+    """
+    root = pylematch._root
+    revised = {}
+
+    for path, content in overrides.items():
+        path = os.path.normpath(os.path.abspath(path))
+        directory = os.path.dirname(path)
+
+        if os.path.basename(path) not in pylematch._protocols or not (
+            directory == root or directory.startswith(root + os.sep)
+        ):
+            raise ValueError(f"'{path}' is not a protocol file inside '{root}'.")
+
+        revised[path] = content
+
+    targets = {os.path.dirname(path) for path in revised}
+    is_gitignore = pylematch._syntax == 'gitignore'
+    dirpath, prefix, rules = pylematch._top()
+    pylematch._start_traversal(dirpath)
+    stack = [(dirpath, prefix, rules, rules, False, False)]
+
+    while stack:
+        dirpath, prefix, old_parent, new_parent, is_affected, inherited = stack.pop()
+        old_rules, items, subdirs = pylematch._list_dir(dirpath, prefix, old_parent)
+
+        is_affected = is_affected or dirpath in targets
+        new_rules = old_rules
+        verdicts = {}
+
+        if is_affected:
+            new_rules = _revise_rules(pylematch, dirpath, old_parent, old_rules, new_parent, revised)
+
+        for relpath, _, old in items:
+            new = old
+            if is_affected:
+                # The revised rules are not the instance's own, so their decisions are not traced. In the `gitignore`
+                # syntax, the content of a matched directory is matched as well.
+                new = pylematch._evaluate(new_rules, relpath, record=False) | inherited
+                if new != old:
+                    yield relpath, old, new
+
+            if is_gitignore and relpath.endswith(os.sep):
+                verdicts[relpath] = new
+
+        for subdir in reversed(subdirs):
+            # Outside the revised subtrees, only the way down to them is listed
+            if is_affected or any(target == subdir[0] or target.startswith(subdir[0] + os.sep) for target in targets):
+                stack.append(
+                    (subdir[0], subdir[1], old_rules, new_rules, is_affected, verdicts.get(subdir[1], False))
+                )
+
+
+def _same_block(old, new, index, count):
+    """
+    Check whether two snapshots hold the same paths and verdicts for `count` entries from `index`.
+
+    The raw offset, path and bitmap bytes of both files are compared, which is much faster than comparing the
+    entries one by one.
+    """
+    size = _OFFSET.size
+    offsets = old._mmap[old._offsets_at + index * size:old._offsets_at + (index + count + 1) * size]
+
+    if offsets != new._mmap[new._offsets_at + index * size:new._offsets_at + (index + count + 1) * size]:
+        return False
+
+    (start, ), (end, ) = _OFFSET.unpack_from(offsets, 0), _OFFSET.unpack_from(offsets, count * size)
+    if old._mmap[old._paths_at + start:old._paths_at + end] != new._mmap[new._paths_at + start:new._paths_at + end]:
+        return False
+
+    # The block starts on a byte boundary of the bitmaps, since `index` and `count` are multiples of 8
+    first, last = index * old._width // 8, (index + count) * old._width // 8
+
+    return old._mmap[old._verdicts_at + first:old._verdicts_at + last] == \
+        new._mmap[new._verdicts_at + first:new._verdicts_at + last]
+
+
+def diff_snapshots(old, new, block=4096):
+    """
+    Compare two snapshots written by `pylematch.snapshot.write_snapshot`.
+
+    The sorted path tables are merged. Where both snapshots hold the same entries at the same positions, as for
+    two rule revisions over the same tree, whole blocks of entries are compared as raw bytes and skipped if
+    identical, so unchanged regions cost a memory comparison only.
+
+    Args:
+        old (Snapshot): The earlier snapshot.
+        new (Snapshot): The later snapshot.
+        block (int): The number of entries compared at once in unchanged regions, a multiple of 8.
+
+    Yields:
+        tuple: A `(relpath, old, new)` tuple for each path whose verdict changes, None standing for a path that
+               is missing from a snapshot.
+
+    Example:
+        with Snapshot('before.snap') as old, Snapshot('after.snap') as new:
+            for path, was_matched, is_matched in diff_snapshots(old, new):
+                print(path, was_matched, is_matched)
+    """
+    i = j = 0
+    is_comparable = old._width == new._width
+    checked = 0  # the entries before this index were in a block that differs, and are compared one by one
+
+    while i < len(old) and j < len(new):
+        if is_comparable and i == j and i % 8 == 0 and i >= checked:
+            count = min(block, len(old) - i, len(new) - j) // 8 * 8
+
+            if count and _same_block(old, new, i, count):
+                i += count
+                j += count
+                continue
+
+            checked = i + count
+
+        old_key, new_key = old._key(i), new._key(j)
+
+        if old_key == new_key:
+            if old._verdict(i) != new._verdict(j):
+                yield os.fsdecode(old_key), old._verdict(i), new._verdict(j)
+            i += 1
+            j += 1
+        elif old_key < new_key:
+            yield os.fsdecode(old_key), old._verdict(i), None
+            i += 1
+        else:
+            yield os.fsdecode(new_key), None, new._verdict(j)
+            j += 1
+
+    for index in range(i, len(old)):
+        yield os.fsdecode(old._key(index)), old._verdict(index), None
+
+    for index in range(j, len(new)):
+        yield os.fsdecode(new._key(index)), None, new._verdict(index)
@@ -0,0 +1,136 @@
+"""
+Module:        Pylematch
+Description:   Content fingerprints of the file set selected by match results.
+Author:        Andrii Burkatskyi aka andr11b
+Year:          2024
+Version:       0.0.1
+License:       MIT License
+Email:         4ndr116@gmail.com, andr11b@ukr.net
+Link:          https://github.com/codyverse/pylematch
+"""
+
+import os
+import hashlib
+import stat
+from collections import defaultdict, deque
+
+
+def _hash_file(path, size, algorithm, mmap_threshold, bufsize=1 << 20):
+    digest = hashlib.new(algorithm)
+
+    with open(path, 'rb') as file:
+        if size and size >= mmap_threshold:
+            import mmap
+
+            # hashlib releases the GIL while hashing a large buffer, so mapped files are hashed in parallel
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                digest.update(mapped)
+        else:
+            for chunk in iter(lambda: file.read(bufsize), b''):
+                digest.update(chunk)
+
+    return digest.digest()
+
+
+def _hash_entry(entry, st, algorithm, mmap_threshold):
+    if stat.S_ISLNK(st.st_mode):
+        return b'l', hashlib.new(algorithm, os.fsencode(os.readlink(entry.path))).digest()
+
+    if not stat.S_ISREG(st.st_mode):
+        # A FIFO, socket or device is recorded by its type only, reading it could block or never end
+        return b's', hashlib.new(algorithm, stat.S_IFMT(st.st_mode).to_bytes(4, 'big')).digest()
+
+    return b'f', _hash_file(entry.path, st.st_size, algorithm, mmap_threshold)
+
+
+def fingerprint(pylematch, exclude=False, workers=4, cache=None, algorithm='sha256', mmap_threshold=1 << 20):
+    """
+    Compute a Merkle-style fingerprint of the selected files and their contents.
+
+    Every file is hashed once, in parallel, and the digest of a directory is derived from the sorted names and
+    digests of its selected children. A directory digest therefore only changes if something below it changes, so
+    it can be used as a cache key for the whole subtree. The digests do not depend on the traversal order.
+
+    Args:
+        pylematch (Pylematch): The instance providing the verdicts.
+        exclude (bool): If False (default), the matched files are fingerprinted. If True, the rules work like
+                        `.gitignore`: matched paths are left out and the content of matched directories is skipped.
+        workers (int): The number of hashing threads.
+        cache (dict): An optional dictionary reused between calls. It maps file paths to their size, modification
+                      time and digest, so unchanged files are not read again. It is updated in place.
+        algorithm (str): The name of a `hashlib` algorithm.
+        mmap_threshold (int): Files of at least this size are memory-mapped instead of being read in chunks.
+
+    Returns:
+        dict: A dictionary mapping relative directory paths (ending with a separator, the root being `''`) to their
+              hex digests. Directories without selected files are omitted, except the root.
+
+    Note:
+        Only the content of regular files is hashed. Symbolic links are hashed by their target, and FIFOs, sockets
+        and devices by their type.
+
+    Example:
+        digests = fingerprint(Pylematch(root='path_to_your_project'), cache=previous_cache)
+        print(digests[''])  # The digest of the whole selected file set
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    cache = {} if cache is None else cache
+    digests = {}
+    pending = deque()
+
+    def _drain(limit):
+        while len(pending) > limit:
+            relpath, st, future = pending.popleft()
+            digests[relpath] = future.result()
+            cache[relpath] = (st.st_size, st.st_mtime_ns, digests[relpath])
+
+    prune = (lambda relpath, is_matched: is_matched) if exclude else None
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for relpath, entry, is_matched in pylematch._walk(prune):
+            if is_matched == exclude or relpath.endswith(os.sep):
+                continue
+
+            st = entry.stat(follow_symlinks=False)
+            cached = cache.get(relpath)
+
+            if cached is not None and cached[:2] == (st.st_size, st.st_mtime_ns):
+                digests[relpath] = cached[2]
+                continue
+
+            pending.append((relpath, st, executor.submit(_hash_entry, entry, st, algorithm, mmap_threshold)))
+            _drain(workers * 4)
+
+        _drain(0)
+
+    # Drop the cached files which are gone or no longer selected
+    for relpath in set(cache) - set(digests):
+        del cache[relpath]
+
+    # Fold the file digests into directory digests, from the deepest directories up to the root
+    children = defaultdict(dict)
+    for relpath, (kind, digest) in digests.items():
+        directory, name = os.path.split(relpath)
+        children[directory][name] = kind + digest
+
+        while directory and os.path.dirname(directory) not in children:
+            children[os.path.dirname(directory)] = {}
+            directory = os.path.dirname(directory)
+
+    children['']  # the root always has a digest
+    result = {}
+
+    for directory in sorted(children, key=lambda path: path.count(os.sep) + bool(path), reverse=True):
+        digest = hashlib.new(algorithm)
+
+        for name, record in sorted(children[directory].items()):
+            digest.update(os.fsencode(name) + b'\0' + record)
+
+        result[directory + os.sep if directory else ''] = digest.hexdigest()
+
+        if directory:
+            parent, name = os.path.split(directory)
+            children[parent][name] = b'd' + digest.digest()
+
+    return result
@@ -10,10 +10,48 @@ Link:          https://github.com/codyverse/pylematch
 """
 
 import os
-import re
-import random
-import string
-from collections import defaultdict
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+# The patterns of protocol files, shared by all instances and keyed by the path, modification time, size and encoding
+# of the files, so an unchanged file is never decoded and split again.
+_PARSED_SIZE = 1024
+_parsed = OrderedDict()
+_parsed_lock = threading.Lock()
+
+# The context-free compositions and matchers of rules, shared by all the rules with the same pattern whatever their
+# directory, so identical protocol files in many directories are composed and compiled once.
+_INTERNED_SIZE = 65536
+_interned = OrderedDict()
+_interned_lock = threading.Lock()
+
+
+def _intern(key, build):
+    """
+    Get a shared value from the intern table, building it on first use.
+
+    Args:
+        key (tuple): The key of the value.
+        build (callable): A function building the value.
+
+    Returns:
+        The shared value.
+    """
+    with _interned_lock:
+        value = _interned.get(key)
+        if value is not None:
+            _interned.move_to_end(key)
+            return value
+
+    value = build()
+
+    with _interned_lock:
+        value = _interned.setdefault(key, value)
+        while len(_interned) > _INTERNED_SIZE:
+            _interned.popitem(last=False)
+
+    return value
 
 
 class Pylematch:
@@ -25,11 +63,32 @@ class Pylematch:
 
     Attributes:
         _root (str): The root directory where the scanning starts.
-        _protocol (str): The filename of the protocol file to be processed (default: `.pylematch`).
+        _protocol (str or list): The filename of the protocol file to be processed (default: `.pylematch`).
+        _protocols (tuple): The protocol file names, in the order they are layered.
         _rules (dict): A dictionary mapping directories to their associated rules.
         _matched (dict): A dictionary of file paths and whether they are matched.
+        _loaded (bool): Whether the directory tree has already been scanned.
+        _lazy (bool): Whether queries are answered on demand instead of scanning the whole tree.
+        _verdicts (OrderedDict): A bounded LRU cache of on-demand verdicts, used in lazy mode.
+        _precompiled (dict): Compiled rules exported by `dump_rules`, keyed by the relative path of protocol files.
+        _scanned (set): The subtrees scanned by `scan`, whose results are in `_matched`.
+        _unexplored (list): The directories left out by the last traversal because of the traversal limits.
+        _profiles (tuple): The names of the rule profiles, if any. With profiles, the verdicts are bitmasks.
+        _bits (dict): The bits of the profiles each rule label (a protocol file or profile name) applies to.
+        _base_rules (list): The in-memory rules of the profiles, which apply from the root directory.
+        _syntax (str): The pattern semantics, `pylematch` or `gitignore`.
+        _inherited (dict): The verdicts inherited by the content of directories partially matched by the profiles,
+                           in the `gitignore` syntax, until the directories are listed.
+        _decisions (dict): The index of the deciding rule in the rules of its directory for every classified path,
+                           -1 if no rule matches, recorded in trace mode.
+        _summaries (dict): The aggregates of every scanned directory, keyed by its relative path, ending with a
+                           separator (empty for the root): the matched and ignored entries and matched bytes of the
+                           directory itself, followed by the same totals for its whole subtree.
     """
 
+    COMPILED_FORMAT = 'pylematch-rules'
+    COMPILED_VERSION = 1
+
     class PylematchRule:
         """
         Represents a single rule in the match protocol.
@@ -40,33 +99,64 @@ class Pylematch:
             regex (str): The compiled regular expression representing the rule.
             is_negation (bool): Whether the rule negates matching files.
             is_strictly_dir (bool): Whether the rule applies only to directories.
+            protocol (str): The name of the protocol file the rule comes from, None for rules added by `add_rule`.
+            filepath (str): The path of the protocol file the rule comes from, if any.
+            line (int): The line number of the rule in its protocol file, if known.
         """
 
-        def __init__(self, pattern, context='', parent=None):
+        def __init__(self, pattern, context='', parent=None, protocol=None, filepath=None, line=None):
             if parent is None or not isinstance(parent, Pylematch):
                 raise Exception("Cannot instantiate PylematchRule directly.")
 
-            self._rule = self._compose(pattern, context)
+            # The pattern is composed and compiled on first use only, so loading large protocol files stays cheap.
+            self._source = (pattern, context)
+            self._rule = None
+            self._compiled = None
+            self._matcher = None
+            self._local = None
+            self._engine = parent._engine
+            self._syntax = parent._syntax
+            self._protocol = protocol
+            self._origin = (filepath, line)
 
         def __str__(self):
-            return self._rule
+            return str(self.rule)
+
+        def __getstate__(self):
+            # Only the composed rule is pickled, the compiled matcher is rebuilt on first use.
+            return (*self.rule.values(), self._engine, self._protocol, self._syntax, *self._origin)
+
+        def __setstate__(self, state):
+            self._rule = dict(zip(('pattern', 'context', 'regex', 'is_negation', 'is_strictly_dir'), state))
+            self._source = (self._rule['pattern'], self._rule['context'])
+            self._compiled = None
+            self._matcher = None
+            self._local = None
+            # Older states carry fewer fields, the missing ones take their defaults
+            extra = (*state[5:], *('regex', None, 'pylematch', None, None)[len(state[5:]):])
+            self._engine, self._protocol, self._syntax = extra[:3]
+            self._origin = tuple(extra[3:5])
 
         def __repr__(self):
-            return f'PylematchRule({self._rule})'
+            return f'PylematchRule({self.rule})'
+
+        def _normalize(self, pattern):
+            """
+            Normalize a raw pattern, hiding escaped characters and bracket expressions behind placeholders.
+
+            Returns:
+                tuple: The normalized pattern, the placeholder map, and the negation and directory flags.
+            """
+            import re
 
-        def _compose(self, pattern, context):
             placeholder_map = {}
 
             def _hidescape(match):
-                placeholder = self._random()
+                placeholder = self._placeholder(placeholder_map)
                 placeholder_map[placeholder] = match.group(0)
 
                 return placeholder
 
-            context = '' if context in {'.', '/'} else re.escape(context.rstrip('/')) + r'/'
-
-            pattern = pattern.strip()
-
             repattern = re.sub(r'\\(.)', _hidescape, pattern)
 
             # Ignore empty lines and comments
@@ -89,24 +179,34 @@ class Pylematch:
             is_strictly_dir = repattern.endswith('/')
             repattern = repattern.rstrip('/')
 
-            if not is_strictly_dir and repattern == '**':
-                repattern = r'.+$'
-            elif not is_strictly_dir and repattern == '*':
-                repattern = r'[^/]+/?$'
-            else:
+            def _rebrackets(match):
+                content = match.group(0)
+
+                if content.startswith('[!'): content = content.replace('[!', '[^')
+
+                placeholder = self._placeholder(placeholder_map)
+                placeholder_map[placeholder] = content
+
+                return f"{placeholder}"
 
-                def _rebrackets(match):
-                    content = match.group(0)
+            repattern = re.sub(r'\[.*?\]', _rebrackets, repattern)
 
-                    if content.startswith('[!'): content = content.replace('[!', '[^')
+            return repattern, placeholder_map, is_negation, is_strictly_dir
 
-                    placeholder = self._random()
-                    placeholder_map[placeholder] = content
+        def _compose(self, pattern, context):
+            import re
+
+            context = '' if context in {'.', '/'} else re.escape(context.rstrip('/')) + r'/'
 
-                    return f"{placeholder}"
+            pattern = pattern.strip()
 
-                repattern = re.sub(r'\[.*?\]', _rebrackets, repattern)
+            repattern, placeholder_map, is_negation, is_strictly_dir = self._normalize(pattern)
 
+            if not is_strictly_dir and repattern == '**':
+                repattern = r'.+$'
+            elif not is_strictly_dir and repattern == '*':
+                repattern = r'[^/]+/?$'
+            else:
                 is_ending = False
 
                 if not is_strictly_dir:
@@ -114,7 +214,7 @@ class Pylematch:
                     if re.search(instance, repattern):
                         is_ending = True
 
-                        placeholder = self._random()
+                        placeholder = self._placeholder(placeholder_map)
                         placeholder_map[placeholder] = r'/(.+)$'
                         repattern = re.sub(instance, placeholder, repattern)
 
@@ -122,7 +222,7 @@ class Pylematch:
                     if re.search(instance, repattern):
                         is_ending = True
 
-                        placeholder = self._random()
+                        placeholder = self._placeholder(placeholder_map)
                         placeholder_map[placeholder] = r'.*'
                         repattern = re.sub(instance, placeholder, repattern)
 
@@ -130,25 +230,25 @@ class Pylematch:
                     if re.search(instance, repattern):
                         is_ending = True
 
-                        placeholder = self._random()
+                        placeholder = self._placeholder(placeholder_map)
                         placeholder_map[placeholder] = r'/[^/]+/?$'
                         repattern = re.sub(instance, placeholder, repattern)
 
                 instance = r'\*\*'  # all instances of the `**`
                 if re.search(instance, repattern):
-                    placeholder = self._random()
+                    placeholder = self._placeholder(placeholder_map)
                     placeholder_map[placeholder] = r'(.*)?'
                     repattern = re.sub(instance, placeholder, repattern)
 
                 instance = r'\*'  # all instances of the `*`
                 if re.search(instance, repattern):
-                    placeholder = self._random()
+                    placeholder = self._placeholder(placeholder_map)
                     placeholder_map[placeholder] = r'[^/]*'
                     repattern = re.sub(instance, placeholder, repattern)
 
                 instance = r'\?'  # all instances of the the `?`
                 if re.search(instance, repattern):
-                    placeholder = self._random()
+                    placeholder = self._placeholder(placeholder_map)
                     placeholder_map[placeholder] = r'[^/]{1}'
                     repattern = re.sub(instance, placeholder, repattern)
 
@@ -172,37 +272,319 @@ class Pylematch:
                 'is_strictly_dir': is_strictly_dir,
             }
 
-        def _random(self, k=8):
-            return f"_{''.join(random.choices(string.ascii_letters + string.digits, k=k))}_"
+        def _compose_gitignore(self, pattern, context):
+            """
+            Compose the regex of a pattern following the `.gitignore` semantics.
+
+            A pattern without a slash, except a trailing one, matches at any depth below its context, and other
+            patterns are anchored to the context. A leading `**/` matches in all directories, a trailing `/**` matches
+            everything inside, and `/**/` matches zero or more directories.
+            """
+            import re
+
+            context = '' if context in {'', '.', '/'} else re.escape(context.rstrip('/')) + r'/'
+
+            pattern = pattern.strip()
+            body = pattern[1:] if pattern.startswith('!') else pattern
+            is_anchored = '/' in body.rstrip('/')
+
+            repattern, placeholder_map, is_negation, is_strictly_dir = self._normalize(pattern)
+
+            def _translate(segment):
+                # A segment matches at least one character, and a bracket expression never matches a slash.
+                regex = '(?=[^/])'
+                for part in re.split(r'(\x00\d+\x00)', segment):
+                    if part in placeholder_map:
+                        value = placeholder_map[part]
+                        regex += re.escape(value[1:]) if value.startswith('\\') else '(?!/)' + value
+                    else:
+                        regex += re.escape(re.sub(r'\*+', '*', part)).replace(r'\*', '[^/]*').replace(r'\?', '[^/]')
+
+                return regex
+
+            if not repattern:
+                regex = '(?!)'  # an empty pattern matches nothing
+            else:
+                segments = repattern.split('/')
+                regex = '^' + context + ('' if is_anchored else '(?:.*/)?')
+
+                for index, segment in enumerate(segments):
+                    is_last = index == len(segments) - 1
+
+                    if segment == '**':
+                        regex += '.+' if is_last else '(?:.*/)?'
+                    else:
+                        regex += _translate(segment) + ('' if is_last else '/')
+
+                regex += r'/$' if is_strictly_dir else r'/?$'
+
+            return {
+                'pattern': pattern,
+                'context': context,
+                'regex': regex,
+                'is_negation': is_negation,
+                'is_strictly_dir': is_strictly_dir,
+            }
+
+        def _escape_context(self, context):
+            """
+            Escape the context of the rule into the regex prefix of its composed pattern, as `_compose` and
+            `_compose_gitignore` do.
+            """
+            import re
+
+            if context in ({'', '.', '/'} if self._syntax == 'gitignore' else {'.', '/'}):
+                return ''
+
+            return re.escape(context.rstrip('/')) + r'/'
+
+        def _placeholder(self, placeholder_map):
+            # NUL cannot occur in a path, so numbered placeholders never clash with the pattern and the composed
+            # regex is the same in every process.
+            return f"\x00{len(placeholder_map)}\x00"
+
+        def _compose_segments(self):
+            """
+            Split the pattern into path segments for the segment engine.
+
+            Returns:
+                list: One item per pattern segment: None for `**`, a string for a literal segment, or the `fullmatch`
+                      method of a compiled regex for a wildcard segment. None if the pattern cannot be matched
+                      segment by segment, e.g., `foo**bar` or a bracket expression that matches a slash.
+            """
+            import re
+
+            if self._syntax == 'gitignore':
+                return None
+
+            repattern, placeholder_map, _, _ = self._normalize(self.pattern)
+            if not repattern:
+                return None
+
+            for value in placeholder_map.values():
+                try:
+                    if re.fullmatch(value, '/'):
+                        return None
+                except re.error:
+                    return None
+
+            segments = []
+            for segment in repattern.split('/'):
+                if segment == '**':
+                    segments.append(None)
+                elif '**' in segment:
+                    return None
+                elif '*' in segment or '?' in segment or '\x00' in segment:
+                    regex = ''
+                    for part in re.split(r'(\x00\d+\x00)', segment):
+                        if part in placeholder_map:
+                            regex += placeholder_map[part]
+                        else:
+                            regex += re.escape(part).replace(r'\*', '[^/]*').replace(r'\?', '[^/]')
+
+                    segments.append(re.compile(regex).fullmatch)
+                else:
+                    segments.append(segment)
+
+            return segments
+
+        def _localize(self):
+            """
+            Get the context of the rule and the function matching a path relative to it.
+
+            The pattern is compiled without its context, and the context is stripped from the path before matching, so
+            the compiled matcher is shared by the rules with the same pattern in every directory.
+
+            Returns:
+                tuple: The context as a plain path prefix (empty for the root) and the matching function.
+            """
+            if self._local is None:
+                import re
+
+                context = '^' + self.context
+                if self.regex.startswith(context):
+                    prefix = re.sub(r'\\(.)', r'\1', self.context, flags=re.S)  # `re.escape` escapes newlines too
+                    body = '^' + self.regex[len(context):]
+                else:
+                    prefix, body = '', self.regex  # e.g. an empty pattern, which matches nothing
+
+                self._compiled, match = _intern(
+                    ('match', self._engine, self._syntax, self.pattern, body), lambda: self._build_local_matcher(body)
+                )
+                self._local = (prefix, match)
+
+            return self._local
+
+        def _build_matcher(self):
+            """
+            Build the function matching a relative path against the rule.
+            """
+            prefix, match = self._localize()
+
+            if not prefix:
+                return match
+
+            return lambda relpath: relpath.startswith(prefix) and match(relpath[len(prefix):])
+
+        def _build_local_matcher(self, body):
+            """
+            Build the function matching a path relative to the context of the rule, for the engine of the rule.
+
+            The `segment` engine splits the path into segments and matches them one by one, so the time is linear in
+            the depth of the path times the length of the pattern. Patterns it cannot handle use the regex.
+
+            Args:
+                body (str): The composed regex of the rule, without its context.
+
+            Returns:
+                tuple: The compiled regex, None for the `segment` engine, and the matching function.
+            """
+            import re
+
+            segments = self._compose_segments() if self._engine == 'segment' else None
+
+            if segments is None:
+                compiled = re.compile(body)
+                match = compiled.match
+
+                return compiled, lambda rest: match(rest) is not None
+
+            is_strictly_dir = self.is_strictly_dir
+
+            def _match(rest):
+                is_dir = rest.endswith('/')
+                if is_dir:
+                    rest = rest[:-1]
+                elif is_strictly_dir:
+                    return False
+
+                if not rest:
+                    return False
+
+                names = rest.split('/')
+                # reach[k] is True if the pattern segments seen so far match exactly the first k path segments
+                reach = [True] + [False] * len(names)
+
+                for segment in segments:
+                    if segment is None:  # `**` matches one or more path segments
+                        seen = False
+                        for k, reached in enumerate(reach):
+                            reach[k], seen = seen, seen or reached
+                    elif segment.__class__ is str:
+                        reach = [False] + [reach[k] and name == segment for k, name in enumerate(names)]
+                    else:
+                        reach = [False] + [reach[k] and segment(name) is not None for k, name in enumerate(names)]
+
+                    if not any(reach):
+                        return False
+
+                return reach[-1]
+
+            return None, _match
+
+        @property
+        def complexity(self):
+            """
+            Estimate the worst-case cost of matching the rule against a path.
+
+            The estimate is the degree of a polynomial in the path length: each unbounded wildcard of the regex may
+            have to backtrack over the whole remaining path, so `**/a/**/b` is rated 2. With the `segment` engine,
+            `**` is matched without backtracking and only the wildcards within a single segment count.
+
+            Returns:
+                int: The estimated degree, 1 meaning linear.
+            """
+            import re
+
+            segments = self._compose_segments() if self._engine == 'segment' else None
+
+            if segments is not None:
+                stars = [segment.__self__.pattern.count('[^/]*') for segment in segments if callable(segment)]
+                return max([1, *stars])
+
+            return max(1, len(re.findall(r'\(\.\*\)\?|\.\*|\.\+|\[\^/\][*+]', self.regex)))
 
         def match(self, relpath):
-            return bool(re.compile(self.regex).match(relpath))
+            if self._matcher is None:
+                self._matcher = self._build_matcher()
+
+            return self._matcher(relpath)
 
         @property
         def rule(self):
+            if self._rule is None:
+                pattern, context = self._source
+                compose = self._compose_gitignore if self._syntax == 'gitignore' else self._compose
+                # The pattern is composed once for every directory, and the context is prepended
+                rule = _intern(('compose', self._syntax, pattern), lambda: compose(pattern, '.'))
+
+                context = self._escape_context(context)
+                regex = rule['regex']
+                if context and regex.startswith('^'):
+                    regex = '^' + context + regex[1:]
+
+                self._rule = {**rule, 'context': context, 'regex': regex}
+
             return self._rule
 
         @property
         def pattern(self):
-            return self._rule['pattern']
+            return self.rule['pattern']
 
         @property
         def regex(self):
-            return self._rule['regex']
+            return self.rule['regex']
 
         @property
         def context(self):
-            return self._rule['context']
+            return self.rule['context']
 
         @property
         def is_strictly_dir(self):
-            return self._rule['is_strictly_dir']
+            return self.rule['is_strictly_dir']
 
         @property
         def is_negation(self):
-            return self._rule['is_negation']
+            return self.rule['is_negation']
+
+        @property
+        def protocol(self):
+            return self._protocol
+
+        @property
+        def filepath(self):
+            return self._origin[0]
 
-    def __init__(self, root, protocol='.pylematch'):
+        @property
+        def line(self):
+            return self._origin[1]
+
+    def __init__(
+        self,
+        root,
+        protocol='.pylematch',
+        lazy=False,
+        cache_size=4096,
+        compiled=None,
+        engine='regex',
+        max_complexity=None,
+        on_complex='warn',
+        time_budget=None,
+        max_depth=None,
+        max_entries=None,
+        timeout=None,
+        follow_symlinks=False,
+        same_filesystem=False,
+        profiles=None,
+        syntax='pylematch',
+        trace=False,
+        aggregate=False,
+        encoding='utf-8',
+        max_file_size=None,
+        max_lines=None,
+        max_errors=1000,
+        log_rate=10,
+    ):
         """
         Initialize the Pylematch instance.
 
@@ -214,11 +596,73 @@ class Pylematch:
             root (str): The root directory where the scanning should begin.
                         This should be an absolute or relative path, and it must point to a valid directory.
                         If the path is relative, it will be resolved relative to the current working directory.
-            protocol (str): The name of the protocol file to use for pattern matching.
+            protocol (str or list): The name of the protocol file to use for pattern matching.
                             Default is `.pylematch`. The file must be readable, and should contain valid match patterns.
+                            Several names can be given, e.g. `['.gitignore', '.dockerignore']`: the protocol files of a
+                            directory are then layered in the given order, so the rules of later names take precedence
+                            over those of earlier names in the same directory. See `verdicts` for a verdict per name.
+            lazy (bool): If True, `is_matched` never scans the tree. Rules for a directory are resolved on first
+                         access by reading only the protocol files along its ancestor path, and verdicts are
+                         computed per query. Methods that need every path, such as `matched`, still scan the tree.
+            cache_size (int): The maximum number of verdicts memoized in lazy mode (least recently used are evicted).
+            compiled (str or dict): A compiled rule set exported by `dump_rules`, or the path to it. Rules of the
+                                    protocol files whose content is unchanged are taken from it as is, and the other
+                                    protocol files are parsed as usual.
+            engine (str): The matching engine: `regex` (default) matches the full path against a regular expression,
+                          `segment` matches the path segment by segment, which keeps patterns with several `**`
+                          linear in the depth of the path. Both engines give the same verdicts.
+            max_complexity (int): The maximum estimated complexity of a rule, see `PylematchRule.complexity`.
+                                  Disabled by default.
+            on_complex (str): What to do with a rule above `max_complexity`: `warn` (default) keeps it and issues a
+                              `RuntimeWarning`, `skip` drops it with a warning, `error` raises a `ValueError`.
+            time_budget (float): The maximum duration of a scan, in seconds. A scan over budget is aborted with a
+                                 `TimeoutError` naming the slowest rule. Disabled by default.
+            max_depth (int): The maximum depth of the paths reported by a traversal, 1 being the entries of the root
+                             directory. Deeper directories are not listed. Unlimited by default.
+            max_entries (int): The maximum number of paths reported by a traversal. Unlimited by default.
+            timeout (float): The maximum duration of a traversal, in seconds. Unlike `time_budget`, a traversal out
+                             of time is not aborted: it stops and keeps the results gathered so far. Unlimited by
+                             default.
+            follow_symlinks (bool): If True, traversals descend into symlinked directories. Each directory is listed
+                                    at most once, so symlink loops end.
+            same_filesystem (bool): If True, traversals do not descend into directories on another filesystem than
+                                    the root directory, like `find -xdev`.
+            profiles (dict): Named rule profiles evaluated together, replacing `protocol`. Each profile is either the
+                             name of a protocol file, or a list of patterns applying from the root directory. A path is
+                             given a bitmask of verdicts, bit `i` being the verdict of the `i`-th profile, and it is
+                             matched if any profile matches it. See `masks` and `matched_by_any`.
+            syntax (str): The pattern semantics: `pylematch` (default), or `gitignore` to follow `.gitignore` exactly.
+                          With `gitignore`, patterns without a slash match at any depth, a leading slash anchors a
+                          pattern to its context, and the content of a matched directory is matched as well: it is
+                          not listed by traversals, and queries answer from the verdicts of the ancestors.
+            trace (bool): If True, the index of the deciding rule is recorded for every classified path, so `explain`
+                          does not match the rules that follow it again. Meant for debugging.
+            aggregate (bool): If True, the full scan also counts the matched and ignored entries of every directory
+                              and sums the sizes of the matched files, see `summary` and `any_matched`.
+            encoding (str): The encoding of the protocol files (default: `utf-8`). A leading byte order mark is
+                            ignored.
+            max_file_size (int): The maximum size of a protocol file, in bytes. Larger files are not loaded.
+                                 Unlimited by default.
+            max_lines (int): The maximum number of lines of a protocol file. Longer files are not loaded. Unlimited
+                             by default.
+            max_errors (int): The maximum number of errors kept in `errors`. Further errors are only counted.
+            log_rate (int): The maximum number of errors logged per second to the `pylematch` logger, the others
+                            being counted in the next message. None disables logging.
+
+        Note:
+            Construction is cheap: the directory tree is not scanned until the first query that needs it.
+
+            The traversal limits apply to the full scan as well as to `walk`, `scan` and `awalk`. When a limit is
+            reached, the results are partial and the directories left out are listed by `unexplored`.
+
+            Symlinked directories are reported as directories, their `os.DirEntry` telling them apart, but are not
+            descended into unless `follow_symlinks` is set.
+
+            Unreadable directories and protocol files do not stop a scan: the errors are collected in `errors`.
 
         Raises:
-            ValueError: If the root directory does not exist or is not a directory.
+            ValueError: If the root directory does not exist or is not a directory, or if the compiled rule set is
+                        not supported.
             OSError: If there are any issues accessing the protocol file.
 
         Example:
@@ -229,153 +673,1625 @@ class Pylematch:
         if not os.path.isdir(self._root):
             raise ValueError(f"The root directory '{self._root}' is invalid or does not exist.")
 
+        if engine not in {'regex', 'segment'}:
+            raise ValueError(f"Unknown matching engine '{engine}', use 'regex' or 'segment'.")
+
+        self._engine = engine
+
+        if syntax not in {'pylematch', 'gitignore'}:
+            raise ValueError(f"Unknown pattern syntax '{syntax}', use 'pylematch' or 'gitignore'.")
+
+        self._syntax = syntax
+        self._inherited = {}
+        self._trace = trace
+        self._decisions = {}
+        self._aggregate = aggregate
+        self._summaries = {}
+
+        if on_complex not in {'warn', 'skip', 'error'}:
+            raise ValueError(f"Unknown complexity policy '{on_complex}', use 'warn', 'skip' or 'error'.")
+
+        self._max_complexity = max_complexity
+        self._on_complex = on_complex
+        self._time_budget = time_budget
+        self._deadline = None
+
+        self._max_depth = max_depth
+        self._max_entries = max_entries
+        self._timeout = timeout
+        self._unexplored = []
+        self._entries = 0
+        self._stop_at = None
+
+        self._follow_symlinks = follow_symlinks
+        self._same_filesystem = same_filesystem
+        self._ancestors = {}
+        self._device = None
+
         self._protocol = protocol
+        self._protocols = (protocol, ) if isinstance(protocol, str) else tuple(protocol)
+        if not self._protocols:
+            raise ValueError("At least one protocol file name is required.")
+
+        self._profiles = None
+        self._bits = {}
+        self._base_rules = []
+        if profiles is not None:
+            self._set_profiles(profiles)
+
+        # The verdict of a directory whose whole content is matched in the `gitignore` syntax
+        self._every = True if self._profiles is None else (1 << len(self._profiles)) - 1
+
         self._rules = defaultdict(list)
         self._matched = {}
-        self._load_rules()
-        self._load_paths()
+        self._loaded = False
+        self._lazy = lazy
+        self._verdicts = OrderedDict()
+        self._cache_size = cache_size
+        self._routed = None
+        self._precompiled = self._read_compiled(compiled) if compiled is not None else {}
+        self._scanned = set()
+
+        self._encoding = encoding
+        self._max_file_size = max_file_size
+        self._max_lines = max_lines
+
+        self._errors = []
+        self._error_count = 0
+        self._max_errors = max_errors
+        self._log_rate = log_rate
+        self._log_window = None
+        self._log_count = 0
+        self._suppressed = 0
+
+    def __getstate__(self):
+        # The rules of the last classified directory are grouped with their compiled matchers, which are not pickled
+        state = self.__dict__.copy()
+        state['_routed'] = None
+
+        return state
+
+    def _set_profiles(self, profiles):
+        """
+        Set up the rule profiles.
+
+        The protocol files of all profiles are read in the same traversal, and each rule applies to the bits of the
+        profiles using its protocol file. The in-memory rules are labelled with the name of their profile.
+
+        Args:
+            profiles (dict): A mapping of profile names to a protocol file name or a list of patterns.
+
+        Raises:
+            ValueError: If there are no profiles, or if the name of a pattern-list profile is a protocol file name.
+        """
+        if not profiles:
+            raise ValueError("At least one rule profile is required.")
+
+        self._profiles = tuple(profiles)
+        protocols = []
+
+        for index, (name, source) in enumerate(profiles.items()):
+            if isinstance(source, str):
+                label = source
+                if source not in protocols:
+                    protocols.append(source)
+            else:
+                label = name
+                self._base_rules.extend(
+                    self.PylematchRule(pattern.strip(), context='.', parent=self, protocol=name)
+                    for pattern in source
+                    if pattern.strip() and not pattern.strip().startswith('#')
+                )
+
+            self._bits[label] = self._bits.get(label, 0) | 1 << index
+
+        if set(protocols) & {name for name, source in profiles.items() if not isinstance(source, str)}:
+            raise ValueError("A profile name cannot be the name of a protocol file used by another profile.")
+
+        self._protocols = tuple(protocols)
+
+    def _read_compiled(self, compiled):
+        """
+        Read and check a compiled rule set.
+
+        Args:
+            compiled (str or dict): The compiled rule set, or the path to it.
+
+        Returns:
+            dict: The compiled rules keyed by the relative path of protocol files.
+        """
+        if not isinstance(compiled, dict):
+            import json
+
+            with open(compiled, 'r', encoding='utf-8') as file:
+                compiled = json.load(file)
+
+        if compiled.get('format') != self.COMPILED_FORMAT or compiled.get('version') != self.COMPILED_VERSION:
+            raise ValueError(
+                f"Unsupported compiled rule set: format '{compiled.get('format')}', "
+                f"version '{compiled.get('version')}'."
+            )
+
+        protocol = compiled.get('protocol')
+        if ((protocol, ) if isinstance(protocol, str) else tuple(protocol or ())) != self._protocols:
+            return {}
+
+        if compiled.get('syntax', 'pylematch') != self._syntax:
+            return {}
+
+        return compiled['files']
+
+    def _load(self):
+        """
+        Scan the directory tree once, on the first query that needs the results.
+
+        The tree is traversed as by `_walk`, keeping the rules of every directory and the verdict of every path.
+        """
+        if not self._loaded:
+            self._loaded = True
+            self._rules.clear()  # drop the rules resolved on demand by lazy queries and subtree scans
+
+            def listings():
+                for dirpath, rules, items in self._traverse(self._top()):
+                    self._rules[dirpath] = rules
+
+                    if self._aggregate:
+                        self._summarize(dirpath, items)
 
-    def _load_rules(self):
+                    yield dirpath, items
+
+            # The results are built apart, so those of earlier subtree scans neither shift the order of `matched` nor
+            # get lost if the scan is aborted, e.g., over its time budget
+            matched = {}
+            try:
+                for relpath, _, is_matched in self._in_order(listings()):
+                    matched[relpath] = is_matched
+            except BaseException:
+                self._loaded = False
+                self._rules.clear()
+                self._summaries.clear()
+                raise
+
+            self._matched = matched
+
+            if self._aggregate:
+                self._fold_summaries()
+
+    def _summarize(self, dirpath, items):
+        """
+        Count the matched and ignored entries of a listed directory, and sum the sizes of its matched files.
+
+        Args:
+            dirpath (str): The absolute path of the directory.
+            items (list): The classified entries of the directory, see `_list_dir`.
+        """
+        matched = ignored = size = 0
+
+        for relpath, entry, is_matched in items:
+            if not is_matched:
+                ignored += 1
+                continue
+
+            matched += 1
+            if not relpath.endswith(os.sep):
+                try:
+                    size += entry.stat(follow_symlinks=False).st_size
+                except OSError:
+                    pass
+
+        prefix = '' if dirpath == self._root else os.path.relpath(dirpath, self._root) + os.sep
+        self._summaries[prefix] = [matched, ignored, size, matched, ignored, size]
+
+    def _fold_summaries(self):
+        """
+        Add the totals of every directory to those of its parent, from the deepest directories up to the root.
+        """
+        for prefix in sorted(self._summaries, key=lambda prefix: prefix.count(os.sep), reverse=True):
+            if prefix:
+                parent = os.path.dirname(prefix.rstrip(os.sep))
+                totals = self._summaries.get(parent + os.sep if parent else '')
+
+                if totals is not None:
+                    for index in range(3, 6):
+                        totals[index] += self._summaries[prefix][index]
+
+    def _resolve_rules(self, directory):
+        """
+        Resolve the rules for a directory on demand.
+
+        Only the protocol files along the ancestor path of the directory are read. The resolved rules are kept
+        in `_rules`, so every directory is resolved at most once.
+
+        Args:
+            directory (str): The absolute path of the directory, located inside the root directory.
+
+        Returns:
+            list: A list of `PylematchRule` objects that apply to the directory.
+        """
+        if directory not in self._rules:
+            rules = self._base_rules if directory == self._root else self._resolve_rules(os.path.dirname(directory))
+            self._rules[directory] = self._inherit_rules(directory, rules)
+
+        return self._rules[directory]
+
+    def _inherit_rules(self, directory, rules, filenames=None, onerror=None):
         """
-        Collect all relative paths and check them against the accumulated rules.
+        Extend the rules inherited from the parent directory with the local protocol files, if any.
+
+        The local protocol files are appended in the order of the protocol names, so the last one takes precedence.
+
+        Args:
+            directory (str): The absolute path of the directory.
+            rules (list): The rules of the parent directory. The list is returned as is if there are no local rules.
+            filenames (set): The names of the files in the directory, if already listed. If omitted, the protocol
+                             files are looked up on disk.
+            onerror (callable): An optional callback for the protocol files that cannot be read, see `walk`.
 
-        Traverses directories from the root to the deepest level to gather
-        match rules from protocol files.
+        Returns:
+            list: A list of `PylematchRule` objects that apply to the directory.
         """
-        for dirpath, _, filenames in sorted(os.walk(self._root), key=lambda x: x[0]):
-            ancestor = dirpath if dirpath == self._root else os.path.dirname(dirpath)
-            self._rules[dirpath].extend(self._rules[ancestor])
+        for protocol in self._protocols:
+            filepath = os.path.join(directory, protocol)
 
-            # Process local rules if the protocol file exists
-            if self._protocol in filenames:
+            if protocol in filenames if filenames is not None else os.path.isfile(filepath):
                 try:
-                    self._parse_file(dirpath, os.path.join(dirpath, self._protocol))
-                except Exception as e:
-                    print(f"Error processing protocol file in directory '{dirpath}': {e}")
+                    local = self._parse_file(directory, filepath)
+                except (OSError, ValueError) as e:
+                    self._report(filepath, 'read', e, onerror)
+                else:
+                    rules = rules + self._check_complexity(local, filepath)
+
+        return rules
+
+    def _check_complexity(self, rules, filepath):
+        """
+        Check the estimated matching complexity of rules against `max_complexity`.
+
+        Args:
+            rules (list): The rules declared in a protocol file.
+            filepath (str): The full path to the protocol file, for the report.
+
+        Returns:
+            list: The rules to keep. With `on_complex='skip'`, the rules above the threshold are dropped.
+
+        Raises:
+            ValueError: If a rule is above the threshold and `on_complex` is `error`.
+        """
+        if self._max_complexity is None:
+            return rules
+
+        kept = []
+        for rule in rules:
+            if rule.complexity <= self._max_complexity:
+                kept.append(rule)
+                continue
+
+            message = (
+                f"The pattern '{rule.pattern}' in '{filepath}' has an estimated complexity of {rule.complexity}, "
+                f"above the maximum of {self._max_complexity}."
+            )
+
+            if self._on_complex == 'error':
+                raise ValueError(message)
+
+            import warnings
+
+            if self._on_complex == 'skip':
+                warnings.warn(message + ' The rule is ignored.', RuntimeWarning, stacklevel=2)
+            else:
+                warnings.warn(message, RuntimeWarning, stacklevel=2)
+                kept.append(rule)
+
+        return kept
 
     def _parse_file(self, directory, filepath):
         """
-        Load rules from the file and store them in rules.
+        Load rules from the file.
 
         Args:
             directory (str): The directory containing the protocol file.
             filepath (str): The full path to the protocol file.
+
+        Returns:
+            list: A list of `PylematchRule` objects declared in the file.
+
+        Raises:
+            OSError: If the file cannot be read.
+            ValueError: If the file cannot be decoded, or exceeds `max_file_size` or `max_lines`.
         """
-        context = os.path.relpath(directory, self._root)
+        precompiled = self._precompiled.get(os.path.relpath(filepath, self._root))
+        if precompiled is not None:
+            if self._max_file_size is not None or self._max_lines is not None:
+                self._read_patterns(filepath)  # the limits apply to exported files as well, before hashing them
 
-        try:
-            with open(filepath, 'r') as file:
-                for line in file:
-                    pattern = line.strip()
+            if self._digest(filepath) == precompiled['sha256']:
+                return [self._restore_rule(state, filepath) for state in precompiled['rules']]
 
-                    if pattern and not pattern.startswith('#'):
-                        rule = self.PylematchRule(pattern, parent=self, context=context)
-                        self._rules[directory].append(rule)
-        except FileNotFoundError:
-            print(f"File not found: The protocol file '{filepath}' does not exist.")
-        except PermissionError:
-            print(f"Error: Permission denied to read '{filepath}'.")
-        except Exception as e:
-            print(f"Error: An unexpected error occurred while reading '{filepath}': {e}")
+        return self._parse_lines(directory, filepath, self._read_patterns(filepath))
+
+    def _report(self, path, operation, error, onerror=None):
+        """
+        Record an error which does not stop the scan.
+
+        The error is kept in `errors` up to `max_errors`, logged within `log_rate`, and passed to `onerror`, which may
+        raise it to abort the traversal, like with `os.walk`.
 
-    def _load_paths(self):
+        Args:
+            path (str): The path of the directory or protocol file.
+            operation (str): What failed: `list` for a directory, `read` for a protocol file.
+            error (Exception): The error.
+            onerror (callable): An optional callback called with the error.
         """
-        Collect all relative paths and check them against the accumulated rules.
+        self._error_count += 1
+        if len(self._errors) < self._max_errors:
+            self._errors.append({'path': path, 'operation': operation, 'error': error})
+
+        if self._log_rate is not None:
+            window = int(time.monotonic())
+            if window != self._log_window:
+                self._log_window, self._log_count = window, 0
+
+            if self._log_count < self._log_rate:
+                import logging
+
+                logger = logging.getLogger('pylematch')
+                if not logger.handlers:
+                    # Silent unless the application configures logging, the import is deferred to the first error
+                    logger.addHandler(logging.NullHandler())
+
+                self._log_count += 1
+                suppressed, self._suppressed = self._suppressed, 0
+                logger.warning(
+                    "Cannot %s '%s': %s%s", operation, path, error,
+                    f" ({suppressed} more errors not logged)" if suppressed else '',
+                )
+            else:
+                self._suppressed += 1
 
-        This method traverses the file tree and applies the rules to each file
-        and directory to determine if they should be matched.
+        if onerror is not None:
+            onerror(error)
+
+    def _read_patterns(self, filepath):
         """
-        relpaths = []
+        Read the patterns of a protocol file.
+
+        The file is read in one call and decoded once. The patterns of a file are cached for all instances, until the
+        modification time or the size of the file changes.
+
+        Args:
+            filepath (str): The full path to the protocol file.
 
-        for dirpath, dirnames, filenames in sorted(os.walk(self._root), key=lambda x: x[0]):
-            for dirname in dirnames:
-                relpaths.append(os.path.relpath(os.path.join(dirpath, dirname), self._root) + os.sep)
+        Returns:
+            list: The `(line, pattern)` tuples of the file, skipping empty lines and comments.
 
-            for filename in filenames:
-                relpaths.append(os.path.relpath(os.path.join(dirpath, filename), self._root))
+        Raises:
+            ValueError: If the file exceeds `max_file_size` or `max_lines`.
+        """
+        with open(filepath, 'rb') as file:
+            stat = os.fstat(file.fileno())
+            key = (filepath, stat.st_mtime_ns, stat.st_size, self._encoding)
+
+            if self._max_file_size is not None and stat.st_size > self._max_file_size:
+                raise ValueError(f"The protocol file is larger than {self._max_file_size} bytes.")
+
+            with _parsed_lock:
+                cached = _parsed.get(key)
+                if cached is not None:
+                    _parsed.move_to_end(key)
+
+            if cached is None:
+                data = file.read() if self._max_file_size is None else file.read(self._max_file_size + 1)
+                if self._max_file_size is not None and len(data) > self._max_file_size:
+                    raise ValueError(f"The protocol file is larger than {self._max_file_size} bytes.")
+
+                text = data.decode(self._encoding)
+                if text.startswith('\ufeff'):
+                    text = text[1:]
+
+                # Universal newlines, as in text mode
+                lines = text.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+                if lines[-1] == '':
+                    lines.pop()
+
+                patterns = []
+                for number, line in enumerate(lines, 1):
+                    pattern = line.strip()
+                    if pattern and not pattern.startswith('#'):
+                        patterns.append((number, pattern))
 
-        for relpath in relpaths:
-            abspath = os.path.join(self._root, relpath)
-            is_matched = False
+                cached = (len(lines), patterns)
 
-            # Check rules for the directory containing the file/directory
-            directory = os.path.dirname(abspath) if abspath != self._root else self._root
+                with _parsed_lock:
+                    _parsed[key] = cached
+                    while len(_parsed) > _PARSED_SIZE:
+                        _parsed.popitem(last=False)
 
-            for rule in self._rules[directory]:
-                if rule.match(relpath):
-                    is_matched = not rule.is_negation
+        if self._max_lines is not None and cached[0] > self._max_lines:
+            raise ValueError(f"The protocol file has more than {self._max_lines} lines.")
 
-            # Store the path status in the dictionary
-            self._matched[relpath] = is_matched
+        return cached[1]
 
-    def is_matched(self, path):
+    def _parse_lines(self, directory, filepath, lines):
         """
-        Public method for checking if a path is matched.
+        Create the rules declared by the lines of a protocol file.
 
         Args:
-            path (str): The absolute or relative path to check.
+            directory (str): The directory containing the protocol file.
+            filepath (str): The full path to the protocol file.
+            lines (iterable): The `(line number, line)` tuples of the file.
 
         Returns:
-            bool: True if the path is matched, False otherwise.
+            list: A list of `PylematchRule` objects, skipping empty lines and comments.
         """
-        path = os.path.normpath(os.path.abspath(path))
-        path = os.path.relpath(path, self._root) + (os.sep if os.path.isdir(path) else '')
+        context = os.path.relpath(directory, self._root)
+        protocol = os.path.basename(filepath)
+        rules = []
 
-        is_matched = self._matched.get(path, None)
+        for number, line in lines:
+            pattern = line.strip()
 
-        return is_matched
+            if pattern and not pattern.startswith('#'):
+                rules.append(self.PylematchRule(
+                    pattern, parent=self, context=context, protocol=protocol, filepath=filepath, line=number
+                ))
 
-    def matched(self):
+        return rules
+
+    def _digest(self, filepath):
+        import hashlib
+
+        with open(filepath, 'rb') as file:
+            return hashlib.sha256(file.read()).hexdigest()
+
+    def _restore_rule(self, state, filepath):
+        # The line number follows the composed rule, if the export has it
+        line = state[5] if len(state) > 5 else None
+        rule = self.PylematchRule(state[0], parent=self)
+        rule.__setstate__((*state[:5], self._engine, os.path.basename(filepath), self._syntax, filepath, line))
+
+        return rule
+
+    def _evaluate(self, rules, relpath, record=True):
         """
-        Public method to retrieve matching results for files and directories.
+        Apply the rules in order to a relative path, the last matching rule wins.
 
-        This method returns a list of tuples, where each tuple contains a relative path and a boolean value indicating
-        whether the file or directory is matched based on the specified rules.
+        Args:
+            rules (list): A list of `PylematchRule` objects for the directory containing the path.
+            relpath (str): The path relative to the root, ending with a separator for directories.
+            record (bool): Whether to record the deciding rule with `trace`. False for rules other than the
+                           instance's own, e.g., revised ones.
 
         Returns:
-            dict: A dictionary where keys are relative paths, and values are booleans indicating whether each
-                  path is matched (True) or ignored (False).
+            bool: True if the path is matched, False otherwise. With profiles, the bitmask of the verdicts instead.
         """
-        return self._matched.items()
+        if self._deadline is not None and time.perf_counter() > self._deadline:
+            self._abort(rules, relpath)
 
-    def get_all_rules(self):
+        if self._profiles is not None:
+            return self._evaluate_mask(rules, relpath)
+
+        if self._trace:
+            index = -1
+            for prefix, group in self._route(rules):
+                if relpath.startswith(prefix):
+                    rest = relpath[len(prefix):]
+                    for position, match, _, _ in group:
+                        if match(rest):
+                            index = position
+
+            if record:
+                self._decisions[relpath] = index
+
+            return index >= 0 and not rules[index].is_negation
+
+        is_matched = False
+
+        for prefix, group in self._route(rules):
+            if relpath.startswith(prefix):
+                rest = relpath[len(prefix):]
+                for _, match, is_negation, _ in group:
+                    if match(rest):
+                        is_matched = not is_negation
+
+        return is_matched
+
+    def _route(self, rules):
         """
-        Public method to retrieve all declared rules.
+        Group the rules of a directory by context, to strip each context from a path once instead of once per rule.
 
-        This method returns a list of all rules defined for each directory.
+        The rules of a directory come from its ancestors, shallower contexts first, so the groups follow the path from
+        the root down to the directory in the trie of contexts. The groups of the last rule list are kept, since all
+        the entries of a directory are classified with the same rules.
+
+        Args:
+            rules (list): A list of `PylematchRule` objects.
 
         Returns:
-            dict: A dictionary where the keys are directory paths and the values are lists of 
-                  `PylematchRule` objects associated with those directories.
+            list: A `(prefix, group)` tuple for each run of rules with the same context, `group` holding an
+                  `(index, match, is_negation, rule)` tuple for each rule, where `match` takes the path relative to the
+                  context.
         """
-        return self._rules.items()
+        routed = self._routed
+        if routed is not None and routed[0] is rules and routed[1] == len(rules):
+            return routed[2]
 
-    def get_rules(self, directory):
+        route = []
+        for index, rule in enumerate(rules):
+            prefix, match = rule._localize()
+            if not route or route[-1][0] != prefix:
+                route.append((prefix, []))
+
+            route[-1][1].append((index, match, rule.is_negation, rule))
+
+        self._routed = (rules, len(rules), route)
+
+        return route
+
+    def _evaluate_mask(self, rules, relpath):
         """
-        Public method to retrieve rules for a specific directory.
+        Apply the rules in order to a relative path, computing the verdicts of all profiles at once.
 
-        Args:
-            directory (str): The directory to fetch rules for.
+        A matching rule sets (or clears, for a negation) the bits of the profiles it applies to, so for every profile
+        the last matching rule wins. Rules added by `add_rule` apply to every profile.
 
         Returns:
-            list: A list of `PylematchRule` objects associated with the specified directory.
+            int: The bitmask of the verdicts, bit `i` being the verdict of the `i`-th profile.
         """
-        return self._rules.get(directory, [])
+        every = (1 << len(self._profiles)) - 1
+        mask = 0
 
-    def add_rule(self, directory, pattern):
+        for prefix, group in self._route(rules):
+            if relpath.startswith(prefix):
+                rest = relpath[len(prefix):]
+                for _, match, is_negation, rule in group:
+                    if match(rest):
+                        bits = self._bits.get(rule.protocol, every)
+                        mask = mask & ~bits if is_negation else mask | bits
+
+        return mask
+
+    def _evaluate_each(self, rules, relpath):
         """
-        Optionally, add a new rule to a specific directory.
+        Apply the rules in order to a relative path, separately for each protocol file name.
 
-        This method adds a new match rule for the specified directory.
+        Rules added by `add_rule` belong to no protocol file and count for every name. With profiles, the verdicts
+        are given per profile name.
 
         Args:
-            directory (str): The directory to add the rule to.
-            pattern (str): The match pattern to add.
+            rules (list): A list of `PylematchRule` objects for the directory containing the path.
+            relpath (str): The path relative to the root, ending with a separator for directories.
+
+        Returns:
+            dict: A dictionary mapping each protocol file name to the verdict of its own rules.
         """
+        if self._profiles is not None:
+            mask = self._evaluate(rules, relpath)
+
+            return {name: bool(mask >> index & 1) for index, name in enumerate(self._profiles)}
+
+        if self._deadline is not None and time.perf_counter() > self._deadline:
+            self._abort(rules, relpath)
+
+        verdicts = dict.fromkeys(self._protocols, False)
+
+        for prefix, group in self._route(rules):
+            if relpath.startswith(prefix):
+                rest = relpath[len(prefix):]
+                for _, match, is_negation, rule in group:
+                    if match(rest):
+                        for protocol in self._protocols if rule.protocol is None else (rule.protocol, ):
+                            verdicts[protocol] = not is_negation
+
+        return verdicts
+
+    def _start_budget(self):
+        """
+        Start the time budget of a scan, if any.
+        """
+        if self._time_budget is not None:
+            self._deadline = time.perf_counter() + self._time_budget
+
+    def _abort(self, rules, relpath):
+        """
+        Abort a scan which is over its time budget, reporting the slowest rule on the path being classified.
+
+        Raises:
+            TimeoutError: Always.
+        """
+        self._deadline = None
+        timings = []
+
+        for rule in rules:
+            start = time.perf_counter()
+            rule.match(relpath)
+            timings.append((time.perf_counter() - start, rule))
+
+        message = f"The scan exceeded its time budget of {self._time_budget}s while classifying '{relpath}'."
+        if timings:
+            elapsed, rule = max(timings, key=lambda timing: timing[0])
+            message += (
+                f" The slowest rule is '{rule.pattern}' (context '{rule.context}', estimated complexity "
+                f"{rule.complexity}), {elapsed * 1000:.3f} ms per match."
+            )
+
+        raise TimeoutError(message)
+
+    def _locate(self, path):
+        """
+        Compute the relative path of an existing path inside the root directory.
+
+        Args:
+            path (str): The normalized absolute path.
+
+        Returns:
+            str: The path relative to the root, ending with a separator for directories, or None if the path is the
+                 root, is not inside it, or does not exist.
+        """
+        relpath = os.path.relpath(path, self._root)
+
+        if relpath in {os.curdir, os.pardir} or relpath.startswith(os.pardir + os.sep) or not os.path.lexists(path):
+            return None
+
+        return relpath + (os.sep if os.path.isdir(path) else '')
+
+    def _query(self, path):
+        """
+        Compute the verdict for a single path on demand, without scanning the tree.
+
+        Args:
+            path (str): The normalized absolute path to check.
+
+        Returns:
+            bool: True if the path is matched, False if it is ignored, None if it is not inside the root directory.
+        """
+        if path in self._verdicts:
+            self._verdicts.move_to_end(path)
+
+            return self._verdicts[path]
+
+        is_matched = None
+        relpath = self._locate(path)
+
+        if relpath is not None:
+            directory = os.path.dirname(path)
+            inherited = self._query(directory) if self._syntax == 'gitignore' and directory != self._root else False
+
+            if inherited and inherited == self._every:
+                is_matched = inherited  # the whole content of a matched directory is matched
+            else:
+                is_matched = self._evaluate(self._resolve_rules(directory), relpath)
+                if inherited:
+                    is_matched |= inherited
+
+        self._verdicts[path] = is_matched
+        if len(self._verdicts) > self._cache_size:
+            self._verdicts.popitem(last=False)
+
+        return is_matched
+
+    def _list_dir(self, dirpath, prefix, rules, prune=None, onerror=None):
+        """
+        List a single directory and classify its entries.
+
+        Args:
+            dirpath (str): The absolute path of the directory.
+            prefix (str): The path of the directory relative to the root, ending with a separator (empty for root).
+            rules (list): The rules inherited from the parent directory.
+            prune (callable): An optional predicate `prune(relpath, is_matched)`, see `walk`.
+            onerror (callable): An optional error callback, see `walk`.
+
+        Returns:
+            tuple: The rules of the directory, a list of `(relpath, entry, is_matched)` tuples for its entries, and a
+                   list of `(dirpath, prefix, rules)` tuples for the subdirectories to descend into, both sorted by
+                   name, so traversals are reproducible.
+        """
+        try:
+            with os.scandir(dirpath) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError as e:
+            self._report(dirpath, 'list', e, onerror)
+            return rules, [], []
+
+        kinds = []
+        for entry in entries:
+            try:
+                kinds.append(entry.is_dir())
+            except OSError:
+                kinds.append(False)
+
+        rules = self._inherit_rules(
+            dirpath, rules, {entry.name for entry, is_dir in zip(entries, kinds) if not is_dir}, onerror
+        )
+        inherited = self._inherited.pop(dirpath, False) if self._inherited else False
+        ancestors = self._ancestors.pop(dirpath, frozenset()) if self._follow_symlinks else None
+        is_gitignore = self._syntax == 'gitignore'
+        items, subdirs = [], []
+
+        for entry, is_dir in zip(entries, kinds):
+            if not is_dir:
+                relpath = prefix + entry.name
+                items.append((relpath, entry, self._evaluate(rules, relpath) | inherited))
+                continue
+
+            relpath = prefix + entry.name + os.sep
+            is_matched = self._evaluate(rules, relpath) | inherited
+            items.append((relpath, entry, is_matched))
+
+            if is_gitignore and is_matched == self._every:
+                continue  # the content is matched as a whole, like in git
+
+            if not (prune is not None and prune(relpath, bool(is_matched))) and self._can_descend(entry, ancestors):
+                if is_gitignore and is_matched:
+                    self._inherited[entry.path] = is_matched
+
+                subdirs.append((entry.path, relpath, rules))
+
+        return rules, items, subdirs
+
+    def _top(self, subpath=None):
+        """
+        Prepare the traversal of the tree or of a subtree.
+
+        For a subtree, only the protocol files along the ancestor path of the subtree are read.
+
+        Args:
+            subpath (str): An optional directory inside the root, absolute or relative to the current directory.
+
+        Returns:
+            tuple: A `(dirpath, prefix, rules)` tuple for the top directory, see `_list_dir`.
+
+        Raises:
+            ValueError: If the subpath is not a directory inside the root directory.
+        """
+        if subpath is None:
+            return self._root, '', self._base_rules
+
+        dirpath = os.path.normpath(os.path.abspath(subpath))
+        relpath = os.path.relpath(dirpath, self._root)
+
+        if relpath == os.curdir:
+            return self._root, '', self._base_rules
+
+        if relpath == os.pardir or relpath.startswith(os.pardir + os.sep) or not os.path.isdir(dirpath):
+            raise ValueError(f"The subpath '{dirpath}' is not a directory inside '{self._root}'.")
+
+        # The content of a matched directory is matched as well in the `gitignore` syntax
+        is_matched = self._query(dirpath) if self._syntax == 'gitignore' else False
+        if is_matched:
+            self._inherited[dirpath] = is_matched
+
+        return dirpath, relpath + os.sep, self._resolve_rules(os.path.dirname(dirpath))
+
+    def _can_descend(self, entry, ancestors=None):
+        """
+        Check whether a traversal may descend into a subdirectory.
+
+        Symlinked directories are only followed with `follow_symlinks`, and then a directory, identified by its device
+        and inode numbers, is not descended into if it is one of its own ancestors, like with `find -L`, so symlink and
+        bind-mount loops end. A directory reached by several paths is listed under each of them. With
+        `same_filesystem`, directories on another device are not descended into.
+
+        Args:
+            entry (os.DirEntry): The entry of the subdirectory.
+            ancestors (frozenset): The device and inode numbers of the directories along the path of the entry, with
+                                   `follow_symlinks`.
+
+        Returns:
+            bool: True if the subdirectory should be listed.
+        """
+        if not self._follow_symlinks and entry.is_symlink():
+            return False
+
+        if not self._follow_symlinks and not self._same_filesystem:
+            return True
+
+        try:
+            st = entry.stat()
+        except OSError:
+            return False
+
+        if self._same_filesystem and st.st_dev != self._device:
+            return False
+
+        if self._follow_symlinks:
+            key = (st.st_dev, st.st_ino)
+            if key in ancestors:
+                return False
+
+            self._ancestors[entry.path] = ancestors | {key}
+
+        return True
+
+    def _start_traversal(self, dirpath):
+        """
+        Reset the traversal limits and the ancestors of pending directories before a traversal starts.
+
+        Args:
+            dirpath (str): The absolute path of the top directory.
+        """
+        self._ancestors = {}
+
+        if self._follow_symlinks or self._same_filesystem:
+            st = os.stat(dirpath)
+            self._device = os.stat(self._root).st_dev
+            self._ancestors[dirpath] = frozenset({(st.st_dev, st.st_ino)})
+
+        self._unexplored = []
+        self._entries = 0
+        self._stop_at = None if self._timeout is None else time.perf_counter() + self._timeout
+
+    def _limit(self, dirpath, prefix, items, subdirs):
+        """
+        Apply the traversal limits to a listed directory.
+
+        Directories which are not descended into because of the limits are recorded in `_unexplored`. A directory
+        whose entries are cut by `max_entries` is recorded as well, since its listing is incomplete.
+
+        Returns:
+            tuple: The entries to report, the subdirectories to descend into, and whether the traversal must stop.
+        """
+        if self._max_entries is not None and self._entries + len(items) > self._max_entries:
+            self._unexplored.append(dirpath)
+            items = items[:self._max_entries - self._entries]
+            self._entries += len(items)
+
+            return items, [], True
+
+        self._entries += len(items)
+
+        # The entries of a subdirectory are two levels below the directory
+        if self._max_depth is not None and prefix.count(os.sep) + 2 > self._max_depth:
+            self._unexplored.extend(subdir[0] for subdir in subdirs)
+            subdirs = []
+
+        is_exhausted = (
+            (self._max_entries is not None and self._entries >= self._max_entries)
+            or (self._stop_at is not None and time.perf_counter() > self._stop_at)
+        )
+
+        return items, subdirs, is_exhausted
+
+    def _traverse(self, top, prune=None, onerror=None):
+        """
+        Traverse a tree top-down within the traversal limits.
+
+        Args:
+            top (tuple): A `(dirpath, prefix, rules)` tuple for the top directory, see `_top`.
+            prune (callable): An optional predicate `prune(relpath, is_matched)`, see `walk`.
+            onerror (callable): An optional error callback, see `walk`.
+
+        Yields:
+            tuple: A `(dirpath, rules, items)` tuple for each listed directory, see `_list_dir`.
+        """
+        stack = [top]
+        self._start_budget()
+        self._start_traversal(top[0])
+
+        try:
+            while stack:
+                dirpath, prefix, rules = stack.pop()
+                rules, items, subdirs = self._list_dir(dirpath, prefix, rules, prune, onerror)
+                items, subdirs, is_exhausted = self._limit(dirpath, prefix, items, subdirs)
+
+                yield dirpath, rules, items
+                stack.extend(reversed(subdirs))
+
+                if is_exhausted:
+                    break
+
+            self._unexplored.extend(subdir[0] for subdir in reversed(stack))
+        finally:
+            self._deadline = None
+
+    def _in_order(self, listings):
+        """
+        Interleave the listings of a traversal in the order of `find`: every directory is followed by its content.
+
+        The directories come depth-first in the order of their names, so the entries of a directory are held only
+        until its subdirectories have been listed, and memory stays bounded by the depth of the tree.
+
+        Args:
+            listings (iterable): A `(dirpath, items)` tuple for each listed directory, in the order of `_traverse`,
+                                 `items` being tuples whose first element is a relative path, sorted by name.
+
+        Yields:
+            tuple: The items of all the directories.
+        """
+        pending = []  # the prefixes and remaining items of the directories along the current path
+
+        for dirpath, items in listings:
+            prefix = '' if dirpath == self._root else os.path.relpath(dirpath, self._root) + os.sep
+
+            while pending and not prefix.startswith(pending[-1][0]):
+                yield from pending.pop()[1]
+
+            if pending:
+                for item in pending[-1][1]:  # the entries of the parent up to the directory itself
+                    yield item
+                    if item[0] == prefix:
+                        break
+
+            pending.append((prefix, iter(items)))
+
+        while pending:
+            yield from pending.pop()[1]
+
+    def _walk(self, prune=None, subpath=None, onerror=None):
+        """
+        Traverse the tree top-down and classify every entry on the fly.
+
+        Unlike the full scan, nothing is accumulated: the rules of a directory are resolved when it is entered and
+        released once it has been listed, so memory stays bounded by the depth of the tree.
+
+        Args:
+            prune (callable): An optional predicate `prune(relpath, is_matched)` called for every directory. If it
+                              returns True, the subtree of the directory is skipped without being listed.
+            subpath (str): An optional directory inside the root, to traverse only its subtree.
+            onerror (callable): An optional error callback, see `walk`.
+
+        Yields:
+            tuple: A `(relpath, entry, is_matched)` tuple for each file and directory, where `entry` is the
+                   `os.DirEntry` of the path, in the order of `_in_order`. Directory paths end with a separator.
+        """
+        listings = (
+            (dirpath, items) for dirpath, _, items in self._traverse(self._top(subpath), prune, onerror)
+        )
+
+        for relpath, entry, is_matched in self._in_order(listings):
+            yield relpath, entry, is_matched if self._profiles is None else bool(is_matched)
+
+    def walk(self, prune=None, subpath=None, per_protocol=False, onerror=None):
+        """
+        Public method to stream matching results while traversing the tree.
+
+        The results are produced as the tree is read and are not stored, which keeps memory bounded on large trees.
+
+        Args:
+            prune (callable): An optional predicate `prune(relpath, is_matched)` called for every directory. If it
+                              returns True, the content of the directory is skipped without being listed.
+            subpath (str): An optional directory inside the root, to stream the results of its content only.
+            per_protocol (bool): If True, each path comes with a verdict per protocol file name instead of the
+                                 combined verdict, see `verdicts`. All protocol files are still read in one traversal.
+            onerror (callable): An optional callback called with the exception of every directory or protocol file
+                                that cannot be read, like with `os.walk`. It may raise the exception to abort the walk.
+                                The errors are also collected in `errors`.
+
+        Yields:
+            tuple: A `(relpath, is_matched)` tuple for each file and directory, in the same format as `matched`.
+                   With `per_protocol`, `is_matched` is a dictionary mapping protocol file names to verdicts. The
+                   order is that of `find`: the entries of a directory are sorted by name, and every directory is
+                   followed by its content, so the output is reproducible.
+
+        Example:
+            # Stream the results, skipping the content of matched directories
+            for path, is_matched in pylematch.walk(prune=lambda path, is_matched: is_matched):
+                print(path, is_matched)
+        """
+        if not per_protocol:
+            for relpath, _, is_matched in self._walk(prune, subpath, onerror):
+                yield relpath, is_matched
+
+            return
+
+        top = self._top(subpath)
+        inherited = {}  # the per-protocol verdicts of matched directories, in the `gitignore` syntax
+
+        if self._syntax == 'gitignore' and top[1]:
+            inherited[top[0]] = self.verdicts(top[0])
+
+        def listings():
+            for dirpath, rules, items in self._traverse(top, prune, onerror):
+                parent = inherited.pop(dirpath, None)
+                results = []
+
+                for relpath, entry, is_matched in items:
+                    verdicts = self._evaluate_each(rules, relpath)
+                    if parent is not None:
+                        verdicts = {name: verdict or parent[name] for name, verdict in verdicts.items()}
+
+                    if self._syntax == 'gitignore' and relpath.endswith(os.sep) and any(verdicts.values()):
+                        if is_matched != self._every:
+                            inherited[entry.path] = verdicts
+
+                    results.append((relpath, verdicts))
+
+                yield dirpath, results
+
+        yield from self._in_order(listings())
+
+    def scan(self, subpath):
+        """
+        Public method to scan a subtree without scanning the whole tree.
+
+        Only the protocol files along the ancestor path of the subtree and inside it are read, and only the subtree
+        is traversed. The results are the same as those of a full scan restricted to the subtree, and `is_matched`
+        answers queries inside a scanned subtree without scanning the rest of the tree.
+
+        Args:
+            subpath (str): A directory inside the root, absolute or relative to the current directory.
+
+        Returns:
+            dict: A dictionary where keys are relative paths of the subtree, including the subpath itself, and values
+                  are booleans indicating whether each path is matched (True) or ignored (False).
+
+        Raises:
+            ValueError: If the subpath is not a directory inside the root directory.
+
+        Example:
+            for path, is_matched in pylematch.scan('path_to_your_project/services/api').items():
+                print(path, is_matched)
+        """
+        dirpath, prefix, rules = self._top(subpath)
+        results = {}
+
+        if prefix:
+            results[prefix] = self._query(dirpath) if self._syntax == 'gitignore' else self._evaluate(rules, prefix)
+
+        listings = ((dirpath, items) for dirpath, _, items in self._traverse((dirpath, prefix, rules)))
+        for relpath, _, is_matched in self._in_order(listings):
+            results[relpath] = is_matched
+
+        self._matched.update(results)
+
+        # A truncated subtree cannot answer queries on its own
+        if not self._unexplored:
+            self._scanned.add(dirpath)
+
+        if self._profiles is not None:
+            return {relpath: bool(mask) for relpath, mask in results.items()}
+
+        return results
+
+    async def awalk(self, prune=None, concurrency=4, executor=None, onerror=None):
+        """
+        Public method to stream matching results without blocking the event loop.
+
+        Directories are listed and classified in an executor, up to `concurrency` directories at a time, and the
+        results are yielded as soon as a directory has been listed. Cancelling the consuming task, or closing the
+        generator, stops the traversal: the directories that are not being listed yet are never listed.
+
+        Args:
+            prune (callable): An optional predicate `prune(relpath, is_matched)`, see `walk`. It is called from the
+                              executor threads.
+            concurrency (int): The maximum number of directories listed at the same time.
+            executor (concurrent.futures.Executor): The executor to list directories in, the loop's default one if
+                                                    omitted.
+            onerror (callable): An optional error callback, see `walk`. It is called from the executor threads.
+
+        Yields:
+            tuple: A `(relpath, is_matched)` tuple for each file and directory. The order of directories is not
+                   defined, it depends on how fast each one is listed.
+
+        Example:
+            async for path, is_matched in pylematch.awalk():
+                print(path, is_matched)
+        """
+        async for _, _, items in self._awalk(prune, concurrency, executor, onerror):
+            for relpath, _, is_matched in items:
+                yield relpath, bool(is_matched)
+
+    async def _awalk(self, prune=None, concurrency=4, executor=None, onerror=None):
+        """
+        Traverse the tree listing up to `concurrency` directories at a time in an executor.
+
+        Yields:
+            tuple: A `(dirpath, rules, items)` tuple for each listed directory, see `_list_dir`.
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        queue = [self._top()]
+        tasks = {}
+        is_exhausted = False
+        self._start_budget()
+        self._start_traversal(queue[0][0])
+
+        try:
+            while (queue or tasks) and not is_exhausted:
+                while queue and len(tasks) < concurrency:
+                    dirpath, prefix, rules = queue.pop()
+                    task = loop.run_in_executor(executor, self._list_dir, dirpath, prefix, rules, prune, onerror)
+                    tasks[task] = (dirpath, prefix)
+
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    dirpath, prefix = tasks.pop(task)
+
+                    if is_exhausted:
+                        self._unexplored.append(dirpath)
+                        continue
+
+                    rules, items, subdirs = task.result()
+                    items, subdirs, is_exhausted = self._limit(dirpath, prefix, items, subdirs)
+                    queue.extend(reversed(subdirs))
+
+                    yield dirpath, rules, items
+
+            self._unexplored.extend(
+                [dirpath for dirpath, _ in tasks.values()] + [subdir[0] for subdir in reversed(queue)]
+            )
+        finally:
+            self._deadline = None
+
+            for task in tasks:
+                task.cancel()
+
+    @classmethod
+    async def scan_async(cls, root, protocol='.pylematch', concurrency=4, executor=None, **kwargs):
+        """
+        Create an instance and scan the tree without blocking the event loop.
+
+        The scan is performed as by `awalk`, and the instance is then ready to answer queries from memory. The results
+        are stored in the order of `matched`, whatever the order in which the directories are listed.
+
+        Args:
+            root (str): The root directory where the scanning should begin.
+            protocol (str or list): The name of the protocol file to use for pattern matching.
+            concurrency (int): The maximum number of directories listed at the same time.
+            executor (concurrent.futures.Executor): The executor to list directories in, the loop's default one if
+                                                    omitted.
+            **kwargs: The other arguments of the constructor, e.g., `syntax` or `aggregate`.
+
+        Returns:
+            Pylematch: The scanned instance.
+
+        Example:
+            pylematch = await Pylematch.scan_async(root='path_to_your_project')
+        """
+        pylematch = cls(root, protocol, **kwargs)
+        listings = {}
+
+        async for dirpath, rules, items in pylematch._awalk(None, concurrency, executor):
+            pylematch._rules[dirpath] = rules
+            listings[dirpath] = items
+
+            if pylematch._aggregate:
+                pylematch._summarize(dirpath, items)
+
+        # Directories finish in any order, store every one right after its entry in its parent, as `_in_order` does
+        stack = [iter(listings.pop(pylematch._root, ()))]
+        while stack:
+            for relpath, entry, is_matched in stack[-1]:
+                pylematch._matched[relpath] = is_matched
+
+                if relpath.endswith(os.sep) and entry.path in listings:
+                    stack.append(iter(listings.pop(entry.path)))
+                    break
+            else:
+                stack.pop()
+
+        if pylematch._aggregate:
+            pylematch._fold_summaries()
+
+        pylematch._loaded = True
+
+        return pylematch
+
+    def verdicts(self, path):
+        """
+        Public method for checking a path against each protocol file name separately.
+
+        The combined verdict of `is_matched` layers all protocol files. This method instead tells, for each name,
+        whether the rules of that name alone match the path, e.g. whether a file is ignored by `.gitignore`, by
+        `.dockerignore`, or both. The verdicts are computed on demand, without scanning the tree.
+
+        Args:
+            path (str): The absolute or relative path to check.
+
+        Returns:
+            dict: A dictionary mapping each protocol file name to True if the path is matched by its rules, False
+                  otherwise, or None if the path is not inside the root directory.
+
+        Example:
+            pylematch = Pylematch(root='.', protocol=['.gitignore', '.dockerignore'])
+            print(pylematch.verdicts('build/output.bin'))  # {'.gitignore': True, '.dockerignore': False}
+        """
+        path = os.path.normpath(os.path.abspath(path))
+        relpath = self._locate(path)
+
+        if relpath is None:
+            return None
+
+        directory = os.path.dirname(path)
+        verdicts = self._evaluate_each(self._resolve_rules(directory), relpath)
+
+        if self._syntax == 'gitignore' and directory != self._root:
+            parent = self.verdicts(directory)
+            verdicts = {name: verdict or parent[name] for name, verdict in verdicts.items()}
+
+        return verdicts
+
+    def summary(self, directory, recursive=True):
+        """
+        Public method to retrieve the aggregates of a directory, computed during the full scan.
+
+        The aggregates cover the entries listed by the scan: in the `gitignore` syntax, the content of matched
+        directories is not listed, and is not counted.
+
+        Args:
+            directory (str): The absolute or relative path of a directory, the root directory included.
+            recursive (bool): If True (default), the aggregates of the whole subtree, otherwise those of the entries
+                              of the directory itself.
+
+        Returns:
+            dict: The number of `matched` and `ignored` entries and the total size in bytes of the matched files
+                  (`matched_bytes`), or None if the directory was not scanned.
+
+        Raises:
+            ValueError: If the instance was not created with `aggregate=True`.
+
+        Example:
+            pylematch = Pylematch(root='path_to_your_project', aggregate=True)
+            print(pylematch.summary('path_to_your_project/build')['matched_bytes'])
+        """
+        if not self._aggregate:
+            raise ValueError("The aggregates are only computed with `aggregate=True`.")
+
+        self._load()
+
+        relpath = os.path.relpath(os.path.normpath(os.path.abspath(directory)), self._root)
+        summary = self._summaries.get('' if relpath == os.curdir else relpath + os.sep)
+
+        if summary is None:
+            return None
+
+        offset = 3 if recursive else 0
+
+        return dict(zip(('matched', 'ignored', 'matched_bytes'), summary[offset:offset + 3]))
+
+    def any_matched(self, directory):
+        """
+        Public method for checking if anything under a directory is matched, without iterating over the results.
+
+        Args:
+            directory (str): The absolute or relative path of a directory, the root directory included.
+
+        Returns:
+            bool: True if any entry of the subtree is matched, False otherwise, or None if it was not scanned.
+
+        Raises:
+            ValueError: If the instance was not created with `aggregate=True`.
+        """
+        summary = self.summary(directory)
+
+        return None if summary is None else summary['matched'] > 0
+
+    def explain(self, path):
+        """
+        Public method for finding out which rule decides the verdict of a path.
+
+        The rules of the directory containing the path are matched in order. In trace mode, the deciding rule is
+        known from the scan, and only the rules before it are matched again to find the overridden ones.
+
+        Args:
+            path (str): The absolute or relative path to explain.
+
+        Returns:
+            dict: The explanation, or None if the path is not inside the root directory:
+                  - `path`: The path relative to the root, ending with a separator for directories.
+                  - `matched`: The verdict of the path.
+                  - `rule`: The last matching `PylematchRule`, which decides the verdict, or None.
+                  - `filepath`, `line`: The protocol file and line number of the deciding rule, if known.
+                  - `overridden`: The other matching rules, in order, whose decision was overridden.
+                  - `inherited`: In the `gitignore` syntax, the matched ancestor directory whose verdict the path
+                    inherits, or None.
+
+        Example:
+            explanation = pylematch.explain('path_to_your_project/build/app.log')
+            print(explanation['rule'].pattern, explanation['filepath'], explanation['line'])
+        """
+        path = os.path.normpath(os.path.abspath(path))
+        relpath = self._locate(path)
+
+        if relpath is None:
+            return None
+
+        directory = os.path.dirname(path)
+
+        if self._syntax == 'gitignore' and directory != self._root and self._query(directory) == self._every:
+            parent = self.explain(directory)
+
+            return dict(parent, path=relpath, inherited=parent['inherited'] or parent['path'])
+
+        rules = self._resolve_rules(directory)
+        index = self._decisions.get(relpath) if self._profiles is None else None
+
+        if index is None:
+            matching = [rule for rule in rules if rule.match(relpath)]
+        else:
+            matching = [rule for rule in rules[:max(index, 0)] if rule.match(relpath)] + rules[index:index + 1]
+
+        rule = matching[-1] if matching else None
+
+        if self._profiles is None and self._syntax == 'pylematch':
+            is_matched = rule is not None and not rule.is_negation
+        else:
+            is_matched = bool(self._query(path))
+
+        return {
+            'path': relpath,
+            'matched': is_matched,
+            'rule': rule,
+            'filepath': rule.filepath if rule is not None else None,
+            'line': rule.line if rule is not None else None,
+            'overridden': matching[:-1],
+            'inherited': None,
+        }
+
+    def is_matched(self, path):
+        """
+        Public method for checking if a path is matched.
+
+        Args:
+            path (str): The absolute or relative path to check.
+
+        Returns:
+            bool: True if the path is matched, False otherwise.
+        """
+        path = os.path.normpath(os.path.abspath(path))
+
+        is_matched = self._lookup(path)
+
+        return is_matched if is_matched is None or self._profiles is None else bool(is_matched)
+
+    def _lookup(self, path):
+        """
+        Look up the verdict of a path, scanning the tree first if needed.
+
+        Args:
+            path (str): The normalized absolute path to check.
+
+        Returns:
+            bool: The verdict of the path, the bitmask of the verdicts with profiles, or None if it is unknown.
+        """
+        if not self._loaded and not any(path == top or path.startswith(top + os.sep) for top in self._scanned):
+            if self._lazy:
+                return self._query(path)
+
+            self._load()
+
+        relpath = os.path.relpath(path, self._root) + (os.sep if os.path.isdir(path) else '')
+        is_matched = self._matched.get(relpath, None)
+
+        if is_matched is None and self._syntax == 'gitignore' and os.path.lexists(path):
+            # The content of a matched directory is not listed, the closest listed ancestor tells
+            directory = os.path.dirname(relpath.rstrip(os.sep))
+
+            while directory and is_matched is None:
+                is_matched = self._matched.get(directory + os.sep, None)
+                directory = os.path.dirname(directory)
+
+            if is_matched is not None and is_matched != self._every:
+                is_matched = None
+
+        return is_matched
+
+    @property
+    def unexplored(self):
+        """
+        The directories left out by the last traversal because of the traversal limits.
+
+        Returns:
+            list: The absolute paths of the directories which were not listed, or not completely listed. The list is
+                  empty if the last traversal was complete.
+        """
+        return list(self._unexplored)
+
+    @property
+    def errors(self):
+        """
+        The errors met since the instance was created, up to `max_errors`.
+
+        Returns:
+            list: A dictionary for each unreadable directory or protocol file, with the `path`, the `operation` that
+                  failed (`list` or `read`) and the `error` raised.
+        """
+        return list(self._errors)
+
+    @property
+    def error_count(self):
+        """
+        The number of errors met since the instance was created, including those left out of `errors`.
+        """
+        return self._error_count
+
+    @property
+    def truncated(self):
+        """
+        Whether the last traversal was cut short by the traversal limits.
+        """
+        return bool(self._unexplored)
+
+    def matched(self):
+        """
+        Public method to retrieve matching results for files and directories.
+
+        This method returns a list of tuples, where each tuple contains a relative path and a boolean value indicating
+        whether the file or directory is matched based on the specified rules.
+
+        Returns:
+            dict: A dictionary where keys are relative paths, and values are booleans indicating whether each
+                  path is matched (True) or ignored (False).
+        """
+        self._load()
+
+        if self._profiles is not None:
+            return {relpath: bool(mask) for relpath, mask in self._matched.items()}.items()
+
+        return self._matched.items()
+
+    @property
+    def profiles(self):
+        """
+        The names of the rule profiles, in the order of their bits in the verdict bitmasks.
+        """
+        return self._profiles or ()
+
+    def mask(self, path):
+        """
+        Public method for retrieving the verdicts of all profiles for a path.
+
+        Args:
+            path (str): The absolute or relative path to check.
+
+        Returns:
+            int: The bitmask of the verdicts, bit `i` being set if the `i`-th profile matches the path, or None if
+                 the path is unknown.
+
+        Raises:
+            ValueError: If the instance has no profiles.
+        """
+        if self._profiles is None:
+            raise ValueError("The instance has no rule profiles.")
+
+        return self._lookup(os.path.normpath(os.path.abspath(path)))
+
+    def masks(self):
+        """
+        Public method to retrieve the verdicts of all profiles for every path.
+
+        The bitmasks are the stored results themselves, computed in a single traversal for all profiles.
+
+        Returns:
+            dict: A view of the relative paths and their bitmasks of verdicts, see `mask`.
+
+        Raises:
+            ValueError: If the instance has no profiles.
+
+        Example:
+            pylematch = Pylematch(root='.', profiles={'ship': '.shipignore', 'lint': ['*.pyc', 'build/']})
+            lint = 1 << pylematch.profiles.index('lint')
+            print([path for path, mask in pylematch.masks() if mask & lint])
+        """
+        if self._profiles is None:
+            raise ValueError("The instance has no rule profiles.")
+
+        self._load()
+
+        return self._matched.items()
+
+    def matched_by_any(self, *names):
+        """
+        Public method to iterate over the paths matched by any profile.
+
+        Args:
+            *names (str): The profiles to consider, all of them if omitted.
+
+        Returns:
+            iterator: The relative paths matched by at least one of the profiles.
+
+        Raises:
+            ValueError: If the instance has no profiles, or a profile name is unknown.
+        """
+        if self._profiles is None:
+            raise ValueError("The instance has no rule profiles.")
+
+        bits = 0
+        for name in names or self._profiles:
+            if name not in self._profiles:
+                raise ValueError(f"Unknown rule profile '{name}'.")
+
+            bits |= 1 << self._profiles.index(name)
+
+        self._load()
+
+        return (relpath for relpath, mask in self._matched.items() if mask & bits)
+
+    def get_all_rules(self):
+        """
+        Public method to retrieve all declared rules.
+
+        This method returns a list of all rules defined for each directory.
+
+        Returns:
+            dict: A dictionary where the keys are directory paths and the values are lists of 
+                  `PylematchRule` objects associated with those directories.
+        """
+        self._load()
+
+        return self._rules.items()
+
+    def get_rules(self, directory):
+        """
+        Public method to retrieve rules for a specific directory.
+
+        Args:
+            directory (str): The directory to fetch rules for.
+
+        Returns:
+            list: A list of `PylematchRule` objects associated with the specified directory.
+        """
+        self._load()
+
+        return self._rules.get(directory, [])
+
+    def dump_rules(self, path):
+        """
+        Public method to export the compiled rules for reuse in other processes.
+
+        The rules of every protocol file are stored with their composed regular expressions and flags, along with a
+        hash of the file content. An instance created with `compiled=path` takes the rules from the export for every
+        protocol file that is unchanged, and parses only the ones that have changed.
+
+        Args:
+            path (str): The path of the JSON file to write.
+
+        Example:
+            Pylematch(root='path_to_your_project').dump_rules('rules.json')
+            pylematch = Pylematch(root='path_to_your_project', compiled='rules.json')
+        """
+        import json
+
+        self._load()
+
+        files = {}
+        for directory, rules in self._rules.items():
+            inherited = [] if directory == self._root else self._rules[os.path.dirname(directory)]
+
+            for protocol in self._protocols:
+                filepath = os.path.join(directory, protocol)
+
+                if os.path.isfile(filepath):
+                    files[os.path.relpath(filepath, self._root)] = {
+                        'sha256': self._digest(filepath),
+                        'rules': [
+                            [*rule.rule.values(), rule.line]
+                            for rule in rules[len(inherited):]
+                            if rule.protocol == protocol
+                        ],
+                    }
+
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(
+                {
+                    'format': self.COMPILED_FORMAT,
+                    'version': self.COMPILED_VERSION,
+                    'protocol': list(self._protocols),  # the protocol files of the profiles, if any
+                    'syntax': self._syntax,
+                    'files': files,
+                },
+                file,
+                separators=(',', ':'),
+            )
+
+    def add_rule(self, directory, pattern):
+        """
+        Optionally, add a new rule to a specific directory.
+
+        This method adds a new match rule for the specified directory.
+
+        Args:
+            directory (str): The directory to add the rule to.
+            pattern (str): The match pattern to add.
+        """
+        self._load()
+
         pattern = pattern.strip()
         if pattern and not pattern.startswith('#'):
             rule = self.PylematchRule(pattern, parent=self)
-            self._rules[directory].append(rule)
+            # Directories without their own protocol file share the rule list of their ancestor, so it is copied
+            self._rules[directory] = self._rules[directory] + [rule]
 
 
 if __name__ == '__main__':
@@ -0,0 +1,227 @@
+"""
+Module:        Pylematch
+Description:   Memory-mapped, read-only snapshots of match results, shared between processes.
+Author:        Andrii Burkatskyi aka andr11b
+Year:          2024
+Version:       0.0.1
+License:       MIT License
+Email:         4ndr116@gmail.com, andr11b@ukr.net
+Link:          https://github.com/codyverse/pylematch
+"""
+
+import os
+import struct
+
+MAGIC = b'PYLESNAP'
+VERSION = 1
+
+# Magic, version, flags, bits per verdict, number of paths, and the offsets of the root, path, offset and verdict
+# sections. All integers are little-endian.
+_HEADER = struct.Struct('<8sIIIQQQQQ')
+_OFFSET = struct.Struct('<Q')
+
+_INHERIT = 1  # the content of a fully matched directory is not listed and inherits its verdict (`gitignore` syntax)
+
+
+def write_snapshot(pylematch, path):
+    """
+    Write the results of a full scan into a snapshot file.
+
+    The file holds the sorted relative paths, a table of their offsets and a bitmap of the verdicts, so it can be
+    memory-mapped by `Snapshot` and queried without being deserialized. The file is written next to its destination
+    and moved into place, so readers never see a partial snapshot.
+
+    Args:
+        pylematch (Pylematch): The instance providing the results. The tree is scanned if it has not been yet.
+        path (str): The path of the snapshot file to create.
+
+    Returns:
+        int: The number of paths in the snapshot.
+
+    Example:
+        write_snapshot(Pylematch(root='path_to_your_project'), 'results.snap')
+    """
+    pylematch._load()
+
+    width = len(pylematch._profiles) if pylematch._profiles is not None else 1
+    flags = _INHERIT if pylematch._syntax == 'gitignore' else 0
+    entries = sorted((os.fsencode(relpath), int(verdict)) for relpath, verdict in pylematch._matched.items())
+
+    root = os.fsencode(pylematch._root)
+    paths_at = _HEADER.size + len(root)
+    offsets_at = paths_at + sum(len(key) for key, _ in entries)
+    verdicts_at = offsets_at + _OFFSET.size * (len(entries) + 1)
+
+    bitmap = bytearray((len(entries) * width + 7) // 8)
+    for index, (_, verdict) in enumerate(entries):
+        for bit in range(width):
+            if verdict >> bit & 1:
+                position = index * width + bit
+                bitmap[position >> 3] |= 1 << (position & 7)
+
+    temporary = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(temporary, 'wb') as file:
+            file.write(_HEADER.pack(
+                MAGIC, VERSION, flags, width, len(entries), _HEADER.size, paths_at, offsets_at, verdicts_at
+            ))
+            file.write(root)
+
+            for key, _ in entries:
+                file.write(key)
+
+            offset = 0
+            file.write(_OFFSET.pack(offset))
+            for key, _ in entries:
+                offset += len(key)
+                file.write(_OFFSET.pack(offset))
+
+            file.write(bitmap)
+
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.unlink(temporary)
+        raise
+
+    return len(entries)
+
+
+class Snapshot:
+    """
+    A read-only view of a snapshot file written by `write_snapshot`.
+
+    The file is memory-mapped: nothing is loaded up front, and processes opening the same snapshot share its pages.
+    Paths are looked up by binary search over the sorted path table.
+
+    Example:
+        with Snapshot('results.snap') as snapshot:
+            print(snapshot.is_matched('path_to_your_project/build/app.log'))
+    """
+
+    def __init__(self, path):
+        """
+        Open a snapshot file.
+
+        Args:
+            path (str): The path of the snapshot file.
+
+        Raises:
+            ValueError: If the file is not a snapshot, or its version is not supported.
+        """
+        import mmap
+
+        with open(path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            header = _HEADER.unpack_from(self._mmap, 0)
+        except struct.error:
+            header = (None, ) * 9
+
+        if header[0] != MAGIC or header[1] != VERSION:
+            self._mmap.close()
+            raise ValueError(f"'{path}' is not a supported snapshot file.")
+
+        _, _, flags, self._width, self._count, root_at, self._paths_at, self._offsets_at, self._verdicts_at = header
+        self._inherit = bool(flags & _INHERIT)
+        self._root = os.fsdecode(self._mmap[root_at:self._paths_at])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, relpath):
+        return self._find(os.fsencode(relpath)) is not None
+
+    def close(self):
+        self._mmap.close()
+
+    @property
+    def root(self):
+        return self._root
+
+    def _key(self, index):
+        start, = _OFFSET.unpack_from(self._mmap, self._offsets_at + index * _OFFSET.size)
+        end, = _OFFSET.unpack_from(self._mmap, self._offsets_at + (index + 1) * _OFFSET.size)
+
+        return self._mmap[self._paths_at + start:self._paths_at + end]
+
+    def _verdict(self, index):
+        verdict = 0
+        for bit in range(self._width):
+            position = index * self._width + bit
+            if self._mmap[self._verdicts_at + (position >> 3)] >> (position & 7) & 1:
+                verdict |= 1 << bit
+
+        return bool(verdict) if self._width == 1 else verdict
+
+    def _find(self, key):
+        low, high = 0, self._count
+
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        return low if low < self._count and self._key(low) == key else None
+
+    def get(self, relpath, default=None):
+        """
+        Look up the verdict of a relative path, in the format of `Pylematch.matched`.
+
+        Args:
+            relpath (str): The path relative to the root, ending with a separator for directories.
+            default: The value to return if the path is not in the snapshot.
+
+        Returns:
+            bool: The verdict, or the bitmask of the verdicts of a snapshot with profiles.
+        """
+        index = self._find(os.fsencode(relpath))
+
+        if index is None and self._inherit:
+            # The content of a fully matched directory is not listed, the closest listed ancestor tells
+            every = True if self._width == 1 else (1 << self._width) - 1
+            directory = os.path.dirname(relpath.rstrip(os.sep))
+
+            while directory:
+                index = self._find(os.fsencode(directory + os.sep))
+                if index is not None:
+                    return self._verdict(index) if self._verdict(index) == every else default
+
+                directory = os.path.dirname(directory)
+
+        return default if index is None else self._verdict(index)
+
+    def is_matched(self, path):
+        """
+        Check if a path is matched, like `Pylematch.is_matched`.
+
+        Args:
+            path (str): The absolute or relative path to check.
+
+        Returns:
+            bool: True if the path is matched, False otherwise, None if it is not in the snapshot.
+        """
+        path = os.path.normpath(os.path.abspath(path))
+        relpath = os.path.relpath(path, self._root) + (os.sep if os.path.isdir(path) else '')
+        verdict = self.get(relpath)
+
+        return verdict if verdict is None else bool(verdict)
+
+    def items(self):
+        """
+        Iterate over the relative paths and verdicts, in sorted order.
+
+        Yields:
+            tuple: A `(relpath, verdict)` tuple for each path.
+        """
+        for index in range(self._count):
+            yield os.fsdecode(self._key(index)), self._verdict(index)
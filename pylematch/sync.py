@@ -0,0 +1,216 @@
+"""
+Module:        Pylematch
+Description:   Filtered tree copy and synchronization driven by match results.
+Author:        Andrii Burkatskyi aka andr11b
+Year:          2024
+Version:       0.0.1
+License:       MIT License
+Email:         4ndr116@gmail.com, andr11b@ukr.net
+Link:          https://github.com/codyverse/pylematch
+"""
+
+import os
+import shutil
+import stat
+from collections import deque
+
+
+def _copy_file(src, dst, size, bufsize=1 << 20):
+    """
+    Copy the content of a file, using zero-copy system calls where available.
+
+    `os.copy_file_range` is tried first (it may share extents on copy-on-write file systems), then `os.sendfile`,
+    and a buffered copy is used as the last resort.
+    """
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        infd, outfd = fsrc.fileno(), fdst.fileno()
+
+        for name in ('copy_file_range', 'sendfile'):
+            call = getattr(os, name, None)
+            if call is None:
+                continue
+
+            offset = 0
+            try:
+                while offset < size:
+                    if name == 'sendfile':
+                        sent = call(outfd, infd, offset, size - offset)
+                    else:
+                        sent = call(infd, outfd, size - offset)
+
+                    if sent == 0:
+                        break
+                    offset += sent
+
+                return
+            except OSError:
+                # Not supported for this pair of files, start over with the next method
+                fsrc.seek(0)
+                fdst.seek(0)
+                fdst.truncate()
+
+        shutil.copyfileobj(fsrc, fdst, bufsize)
+
+
+def _is_unchanged(st, dst):
+    try:
+        dst_st = os.stat(dst, follow_symlinks=False)
+    except OSError:
+        return False
+
+    return (
+        stat.S_IFMT(dst_st.st_mode) == stat.S_IFMT(st.st_mode)
+        and dst_st.st_size == st.st_size
+        and dst_st.st_mtime_ns == st.st_mtime_ns
+    )
+
+
+def _copy_entry(entry, st, dst):
+    try:
+        dst_st = os.stat(dst, follow_symlinks=False)
+    except FileNotFoundError:
+        dst_st = None
+
+    # Never write through what an earlier copy left there, e.g., a link pointing outside the destination
+    if dst_st is not None and (stat.S_ISLNK(st.st_mode) or not stat.S_ISREG(dst_st.st_mode)):
+        os.unlink(dst)
+
+    if stat.S_ISLNK(st.st_mode):
+        os.symlink(os.readlink(entry.path), dst)
+    else:
+        _copy_file(entry.path, dst, st.st_size)
+        shutil.copymode(entry.path, dst)
+
+    os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns), follow_symlinks=False)
+
+
+def _delete_extraneous(dst, selected):
+    deleted = 0
+
+    for dirpath, dirnames, filenames in os.walk(dst, topdown=False):
+        for name in filenames + dirnames:
+            path = os.path.join(dirpath, name)
+            relpath = os.path.relpath(path, dst)
+
+            if os.path.isdir(path) and not os.path.islink(path):
+                if relpath + os.sep not in selected and not os.listdir(path):
+                    os.rmdir(path)
+                    deleted += 1
+            elif relpath not in selected and relpath + os.sep not in selected:
+                os.unlink(path)
+                deleted += 1
+
+    return deleted
+
+
+def copy_tree(pylematch, dst, exclude=True, workers=4, delete=False):
+    """
+    Mirror the files selected by match results into another directory.
+
+    Files whose size and modification time are unchanged in the destination are skipped, so repeated runs only copy
+    what has changed. The copies are spread over a thread pool and use `os.copy_file_range` or `os.sendfile` where
+    the platform supports them.
+
+    Args:
+        pylematch (Pylematch): The instance providing the verdicts.
+        dst (str): The destination directory. It is created if it does not exist.
+        exclude (bool): If True (default), matched paths are not copied and the content of matched directories is
+                        skipped without being listed, i.e., the rules work like `.gitignore`.
+                        If False, only matched paths are copied.
+        workers (int): The number of copying threads.
+        delete (bool): If True, files and empty directories in the destination that are not selected are deleted.
+
+    Returns:
+        dict: The number of `copied`, `skipped` (unchanged) and `deleted` paths.
+
+    Note:
+        Only regular files, directories and symbolic links are copied. FIFOs, sockets and devices are left out.
+
+    Raises:
+        OSError: If a file cannot be copied. The remaining copies are completed first.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    dst = os.path.abspath(dst)
+    os.makedirs(dst, exist_ok=True)
+
+    stats = {'copied': 0, 'skipped': 0, 'deleted': 0}
+    selected = set() if delete else None
+    created = {dst}
+    pending = deque()
+    errors = []
+
+    def _drain(limit):
+        while len(pending) > limit:
+            error = pending.popleft().exception()
+            if error is not None:
+                errors.append(error)
+
+    # Never copy the destination into itself
+    inside = os.path.relpath(dst, pylematch._root) + os.sep
+
+    def prune(relpath, is_matched):
+        return (exclude and is_matched) or relpath == inside
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for relpath, entry, is_matched in pylematch._walk(prune):
+            if is_matched == exclude or relpath == inside:
+                continue
+
+            if selected is not None:
+                selected.add(relpath)
+
+            target = os.path.join(dst, relpath.rstrip(os.sep))
+            st = entry.stat(follow_symlinks=False)
+            is_link = stat.S_ISLNK(st.st_mode)
+
+            # A symbolic link to a directory is walked into, and so copied as a directory, with `follow_symlinks`
+            if relpath.endswith(os.sep) and (not is_link or pylematch._follow_symlinks):
+                os.makedirs(target, exist_ok=True)
+                created.add(target)
+                continue
+
+            if not (is_link or stat.S_ISREG(st.st_mode)):
+                continue  # FIFOs, sockets and devices cannot be copied, and reading a FIFO would block
+
+            parent = os.path.dirname(target)
+            if parent not in created:
+                os.makedirs(parent, exist_ok=True)
+                created.add(parent)
+
+            if _is_unchanged(st, target):
+                stats['skipped'] += 1
+                continue
+
+            stats['copied'] += 1
+            pending.append(executor.submit(_copy_entry, entry, st, target))
+            _drain(workers * 4)
+
+        _drain(0)
+
+    if errors:
+        raise errors[0]
+
+    if delete:
+        stats['deleted'] = _delete_extraneous(dst, selected)
+
+    return stats
+
+
+def sync(pylematch, dst, exclude=True, workers=4):
+    """
+    Synchronize a directory with the files selected by match results.
+
+    This is `copy_tree` with `delete=True`: unchanged files are skipped, and paths that are no longer selected are
+    removed from the destination.
+
+    Args:
+        pylematch (Pylematch): The instance providing the verdicts.
+        dst (str): The destination directory.
+        exclude (bool): If True (default), matched paths are left out, otherwise only matched paths are kept.
+        workers (int): The number of copying threads.
+
+    Returns:
+        dict: The number of `copied`, `skipped` (unchanged) and `deleted` paths.
+    """
+    return copy_tree(pylematch, dst, exclude=exclude, workers=workers, delete=True)